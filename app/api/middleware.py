@@ -0,0 +1,132 @@
+import hmac
+import logging
+import random
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+from app.services.metrics import http_requests, http_duration, http_response_size
+from app.services.profiler import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+PROFILES_PATH = "/debug/profiles"
+
+# Requests that match no route share one label, so unknown paths cannot
+# grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+def route_template(scope) -> str:
+    """Path with parameter values put back as {name}, e.g. /api/drivers/{driver_id}"""
+    if scope.get("route") is None:
+        # Mounted apps (static files) set only their endpoint and root path;
+        # they get one series for the whole mount
+        if scope.get("endpoint") is not None:
+            return scope.get("root_path") or "/"
+        return UNMATCHED_ROUTE
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        "{" + names[segment] + "}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+class MetricsMiddleware:
+    """Records latency, status and body size per route template.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so responses are
+    streamed through untouched and the cost per request stays at a few
+    dict updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, path, str(status))
+            http_duration.observe(time.perf_counter() - started, method, path)
+            http_response_size.observe(size, path)
+
+class ProfilingMiddleware:
+    """Profiles requests that carry the profiling token, or a random sample.
+
+    Only installed when profiling is enabled, so normal deployments pay
+    nothing. A profiled response carries X-Profile-Id; the profile can then
+    be fetched from /debug/profiles/{id}.
+    """
+
+    def __init__(self, app, store: ProfileStore, token: Optional[str] = None, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+
+    def _requested(self, scope) -> bool:
+        if not self.token:
+            return False
+        value = None
+        for name, header in scope["headers"]:
+            if name == b"x-profile":
+                value = header.decode("latin-1")
+                break
+        if value is None and b"profile=" in scope["query_string"]:
+            value = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+        return value is not None and hmac.compare_digest(value, self.token)
+
+    def _wanted(self, scope) -> bool:
+        if scope["path"].startswith(PROFILES_PATH):
+            return False
+        if self._requested(scope):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = self.store.start()
+        if profiler is None:
+            # Another request is being profiled
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            profile = self.store.finish(profiler, profile_id, scope["method"], scope["path"], status, duration)
+            logger.info(f"Profiled {scope['method']} {scope['path']} ({duration * 1000:.1f}ms) as {profile_id}")
+            if not self.token:
+                # Without a token the profiles cannot be downloaded, so log them
+                logger.info(profile.text(limit=15))
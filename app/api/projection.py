@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+# List routes take ?fields= to return only some fields of each item, e.g.
+# fields=position,points,driver.driverId, and ?format=compact to return the
+# items as parallel arrays ({"position": [1, 2], "points": [...]}) instead
+# of an array of objects. Both are applied to the cached records, so the
+# smaller body is also cheaper to build; each rendering is cached on its own.
+
+COMPACT = "compact"
+
+@lru_cache(maxsize=None)
+def field_paths(model: Type[BaseModel]) -> Tuple[str, ...]:
+    """Leaf fields of an item model by alias, nested ones dotted (driver.driverId)"""
+    paths = []
+    for name, info in model.model_fields.items():
+        alias = info.alias or name
+        if isinstance(info.annotation, type) and issubclass(info.annotation, BaseModel):
+            paths.extend(f"{alias}.{path}" for path in field_paths(info.annotation))
+        else:
+            paths.append(alias)
+    return tuple(paths)
+
+def parse_fields(fields: str, model: Type[BaseModel]) -> Tuple[str, ...]:
+    """Requested fields in model order; naming a nested object selects all of its fields"""
+    known = field_paths(model)
+    selected = set()
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        matches = [path for path in known if path == name or path.startswith(name + ".")]
+        if not matches:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}. Available: {', '.join(known)}")
+        selected.update(matches)
+    if not selected:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    return tuple(path for path in known if path in selected)
+
+def _lookup(record: Optional[Dict], parts: Tuple[str, ...]) -> Any:
+    for part in parts:
+        if record is None:
+            return None
+        record = record.get(part)
+    return record
+
+@dataclass(frozen=True)
+class Projection:
+    model: Type[BaseModel]
+    fields: Optional[Tuple[str, ...]] = None  # None: every field
+    compact: bool = False
+
+    @property
+    def view(self) -> Optional[str]:
+        """Cache key suffix for this rendering; None for the full response"""
+        parts = []
+        if self.fields is not None:
+            parts.append("fields=" + ",".join(self.fields))
+        if self.compact:
+            parts.append(f"format={COMPACT}")
+        return "&".join(parts) or None
+
+    def apply(self, records: List[Dict]) -> Any:
+        """Projected item list, or {field: [values]} in compact format"""
+        paths = self.fields if self.fields is not None else field_paths(self.model)
+        split = [(path, tuple(path.split("."))) for path in paths]
+        if self.compact:
+            return {path: [_lookup(record, parts) for record in records] for path, parts in split}
+
+        items = []
+        for record in records:
+            item = {}
+            for _, parts in split:
+                target = item
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                target[parts[-1]] = _lookup(record, parts)
+            items.append(item)
+        return items
+
+def projection_params(model: Type[BaseModel]):
+    """Dependency reading ?fields= and ?format= for a list of model items"""
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return, e.g. position,points,driver.driverId"
+        ),
+        format: str = Query("json", pattern=f"^(json|{COMPACT})$", description="compact: parallel arrays per field")
+    ) -> Projection:
+        return Projection(
+            model=model,
+            fields=parse_fields(fields, model) if fields is not None else None,
+            compact=format == COMPACT
+        )
+    return dependency
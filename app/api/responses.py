@@ -0,0 +1,191 @@
+import gzip
+import hashlib
+import json
+from dataclasses import replace
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Set
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from app.core.config import settings
+from app.services.cache_codec import CachedResponse
+from app.services.cache_service import CacheResult
+from app.services.circuit_breaker import breakers
+from app.services.season_data import SeasonIndex
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Client/CDN caching per resource family. Data changes a few times per race
+# weekend, so browsers may reuse a body briefly and then revalidate with
+# If-None-Match, which is answered with a bodiless 304.
+CACHE_CONTROL = {
+    "drivers": "public, max-age=600, stale-while-revalidate=3600",
+    "standings": "public, max-age=120, stale-while-revalidate=600",
+    "races": "public, max-age=600, stale-while-revalidate=3600",
+    "next_race": "public, max-age=30, stale-while-revalidate=60",
+    "race_results": "public, max-age=300, stale-while-revalidate=3600",
+    "season_results": "public, max-age=300, stale-while-revalidate=3600",
+    # Carries the next-race countdown
+    "bundle": "public, max-age=30, stale-while-revalidate=60",
+}
+# Used while serving a stale value, so clients come back for the refresh
+STALE_CACHE_CONTROL = "public, no-cache"
+# Upstream endpoint families (circuit breakers) behind each resource
+UPSTREAM_FAMILY = {
+    "drivers": ("drivers",),
+    "standings": ("standings",),
+    "races": ("races",),
+    "next_race": ("races",),
+    "race_results": ("results",),
+    "season_results": ("races", "results"),
+    "bundle": ("drivers", "races", "standings"),
+}
+NO_STORE = "no-store"
+
+def build_cached_response(content: Any) -> CachedResponse:
+    """Serialize and compress a response body once, for storage in the cache"""
+    if isinstance(content, BaseModel):
+        body = content.model_dump_json(by_alias=True).encode("utf-8")
+    else:
+        # Records are plain JSON types already; the encoder only handles the rest
+        body = json.dumps(
+            content,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=jsonable_encoder
+        ).encode("utf-8")
+
+    encodings = {}
+    if len(body) >= settings.response_compress_min_size:
+        encodings["gzip"] = gzip.compress(body, compresslevel=settings.response_gzip_level)
+        if brotli is not None:
+            encodings["br"] = brotli.compress(body, quality=settings.response_brotli_quality)
+
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return CachedResponse(body=body, etag=etag, encodings=encodings)
+
+def _accepted_encodings(request: Request) -> Set[str]:
+    """Codings the client accepts, ignoring any with q=0"""
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+def _choose_encoding(request: Request, cached: CachedResponse) -> Optional[str]:
+    accepted = _accepted_encodings(request)
+    for name in ("br", "gzip"):
+        if name in cached.encodings and (name in accepted or "*" in accepted):
+            return name
+    return None
+
+def is_degraded(result: CacheResult, resource: str) -> bool:
+    """Whether a value is served from cache because upstream is failing"""
+    return result.degraded or any(breakers.degraded(family) for family in UPSTREAM_FAMILY.get(resource, ()))
+
+def cache_status_headers(result: CacheResult, resource: str = None) -> Dict[str, str]:
+    """Headers telling the client how a cached value was served"""
+    headers = {"Age": str(int(result.age))}
+    if result.stale:
+        headers["X-Cache"] = "STALE"
+        headers["Warning"] = '110 - "Response is Stale"'
+    else:
+        headers["X-Cache"] = "HIT" if result.hit else "MISS"
+    if is_degraded(result, resource):
+        headers["X-Degraded"] = "upstream-unavailable"
+    return headers
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+def cached_response(request: Request, result: CacheResult, resource: str) -> Response:
+    """Return the stored body for a cache result, compressed if the client allows.
+
+    Conditional requests whose validators still match get a 304 straight
+    from the cached ETag, without reading or sending the body.
+    """
+    cached: CachedResponse = result.value
+
+    headers = cache_status_headers(result, resource)
+    headers["ETag"] = cached.etag
+    headers["Vary"] = "Accept-Encoding"
+    # Neither stale nor degraded bodies should be reused without revalidating
+    if result.stale or "X-Degraded" in headers:
+        headers["Cache-Control"] = STALE_CACHE_CONTROL
+    else:
+        headers["Cache-Control"] = CACHE_CONTROL[resource]
+    if result.stored_at:
+        headers["Last-Modified"] = formatdate(result.stored_at, usegmt=True)
+
+    if _not_modified(request, cached.etag, result.stored_at):
+        return Response(status_code=304, headers=headers)
+
+    encoding = _choose_encoding(request, cached)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=cached.encodings[encoding] if encoding else cached.body,
+        media_type=cached.media_type,
+        headers=headers
+    )
+
+def upstream_unavailable(error: Exception) -> HTTPException:
+    """503 for data that is neither cached nor fetchable right now"""
+    return HTTPException(
+        status_code=503,
+        detail=f"Upstream data source unavailable: {str(error)}",
+        headers={"Retry-After": str(int(settings.breaker_reset_timeout)), "Cache-Control": NO_STORE}
+    )
+
+def derived_response(
+    request: Request, source: CacheResult, index: SeasonIndex, entity: str, build: Callable[[], Any], resource: str
+) -> Response:
+    """Render a value picked out of a cached collection, keeping its cache metadata.
+
+    The ETag comes from the collection version and the entity, so a matching
+    If-None-Match gets its 304 before anything is built; bodies are rendered
+    once per collection version and kept on its index.
+    """
+    cached = index.renders.get(entity)
+    if cached is None:
+        version = f"{index.key}/{entity}@{source.stored_at}".encode("utf-8")
+        etag = '"' + hashlib.blake2b(version, digest_size=16).hexdigest() + '"'
+        if _not_modified(request, etag, source.stored_at):
+            # A 304 only needs the validators
+            cached = CachedResponse(body=b"", etag=etag)
+        else:
+            cached = replace(build_cached_response(build()), etag=etag)
+            index.renders[entity] = cached
+    return cached_response(request, replace(source, value=cached), resource)
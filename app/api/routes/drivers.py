@@ -1,69 +1,79 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 from app.models.schemas import DriversResponse, DriverResponse
-from app.services.fastf1_service import fastf1_service
+from app.services import cache_keys
 from app.services.cache_service import cache_service
+from app.services.season_data import season_data
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.api.projection import Projection, projection_params
+from app.api.responses import build_cached_response, cached_response, derived_response, upstream_unavailable
 
 router = APIRouter()
 
 @router.get("/", response_model=DriversResponse)
-async def get_drivers(season: Optional[int] = Query(None, description="Season year")):
+async def get_drivers(
+    request: Request,
+    season: Optional[int] = Query(None, description="Season year"),
+    projection: Projection = Depends(projection_params(DriverResponse))
+):
     """Get all drivers for a specific season"""
     try:
-        # Check cache first
-        cache_key = f"drivers:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
+        season = cache_keys.resolve_season(season)
+        key = cache_keys.drivers_key(season)
+        tags = [
+            cache_keys.season_tag(season), "drivers", cache_keys.views_tag(key),
+            cache_keys.source_tag(cache_keys.drivers_data_key(season))
+        ]
         
-        if cached_data:
-            return DriversResponse(**cached_data)
+        async def load_drivers():
+            # Fetch the cached season collection
+            drivers_data = (await season_data.get_drivers(season)).value
+            if not drivers_data:
+                return None
+            if projection.view:
+                return build_cached_response({
+                    "drivers": projection.apply(drivers_data),
+                    "total": len(drivers_data),
+                    "season": season
+                })
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(DriversResponse(
+                drivers=drivers_data,
+                total=len(drivers_data),
+                season=season
+            ))
         
-        # Fetch from FastF1
-        drivers_data = await fastf1_service.get_drivers(season)
+        # Concurrent misses share a single upstream fetch
+        result = await cache_service.get_or_set(cache_keys.view_key(key, projection.view), load_drivers, ttl=3600, tags=tags)  # 1 hour cache
         
-        if not drivers_data:
+        if not result.value:
             raise HTTPException(status_code=404, detail="No drivers found for this season")
         
-        response_data = {
-            "drivers": drivers_data,
-            "total": len(drivers_data),
-            "season": season or fastf1_service.current_season
-        }
-        
-        # Cache the response
-        await cache_service.set(cache_key, response_data, ttl=3600)  # 1 hour cache
-        
-        return DriversResponse(**response_data)
-        
+        return cached_response(request, result, "drivers")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching drivers: {str(e)}")
 
 @router.get("/{driver_id}", response_model=DriverResponse)
-async def get_driver(driver_id: str, season: Optional[int] = Query(None, description="Season year")):
+async def get_driver(request: Request, driver_id: str, season: Optional[int] = Query(None, description="Season year")):
     """Get specific driver information"""
     try:
-        # Check cache first
-        cache_key = f"driver:{driver_id}:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return DriverResponse(**cached_data)
-        
-        # Fetch all drivers and find the specific one
-        drivers_data = await fastf1_service.get_drivers(season)
-        
-        driver = next((d for d in drivers_data if d['driverId'] == driver_id), None)
+        # Look the driver up in the indexed season collection
+        drivers, index = await season_data.driver_index(season)
+        driver = index.get('driverId', driver_id)
         
         if not driver:
             raise HTTPException(status_code=404, detail=f"Driver {driver_id} not found")
         
-        # Cache the response
-        await cache_service.set(cache_key, driver, ttl=3600)  # 1 hour cache
-        
-        return DriverResponse(**driver)
-        
+        return derived_response(request, drivers, index, driver_id, lambda: DriverResponse(**driver), "drivers")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching driver: {str(e)}")
@@ -1,29 +1,63 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import HealthResponse
-from app.services.fastf1_service import fastf1_service
+from fastapi import APIRouter, HTTPException, Response
+from app.models.schemas import HealthResponse, LivenessResponse, ReadinessResponse
+from app.services.executor import upstream_executor
+from app.services.cache_service import cache_service
+from app.services.health_prober import health_prober
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.circuit_breaker import breakers
+from app.api.responses import NO_STORE
 from datetime import datetime
-import fastf1.ergast
 
 router = APIRouter()
 
+VERSION = "1.0.0"
+
+# Probes only read in-memory state: the background prober does the I/O, so
+# their cost does not depend on how often they are called.
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(response: Response):
     """Health check endpoint"""
+    # Health must always reflect the live process, never a cached copy
+    response.headers["Cache-Control"] = NO_STORE
     try:
-        # Test FastF1 connection
-        fastf1_status = "healthy"
-        try:
-            # Try to get basic drivers info to test FastF1
-            ergast = fastf1.ergast.Ergast()
-            ergast.get_driver_info(2025)
-        except Exception as e:
-            fastf1_status = f"error: {str(e)}"
-        
         return HealthResponse(
             status="healthy",
             timestamp=datetime.now(),
-            version="1.0.0",
-            fastf1_status=fastf1_status
+            version=VERSION,
+            fastf1_status=health_prober.upstream['status'],
+            executor=upstream_executor.stats(),
+            cache=cache_service.stats()
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+
+@router.get("/health/live", response_model=LivenessResponse)
+async def liveness(response: Response):
+    """Liveness probe: the process is serving requests (no I/O)"""
+    response.headers["Cache-Control"] = NO_STORE
+    return LivenessResponse(status="alive", timestamp=datetime.now(), version=VERSION)
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """Readiness probe: last upstream check, cache, executor and data freshness"""
+    response.headers["Cache-Control"] = NO_STORE
+    if not health_prober.checked:
+        status = "starting"
+        response.status_code = 503
+    elif health_prober.upstream['status'] != "healthy":
+        # Cached data is still served while upstream is down
+        status = "degraded"
+    else:
+        status = "ready"
+    return ReadinessResponse(
+        status=status,
+        timestamp=datetime.now(),
+        version=VERSION,
+        upstream=health_prober.upstream,
+        cache=cache_service.stats(),
+        executor=upstream_executor.stats(),
+        seasons=health_prober.seasons,
+        scheduler=refresh_scheduler.stats(),
+        breakers=breakers.stats()
+    )
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Response
+from app.services.metrics import metrics, CONTENT_TYPE
+from app.services.executor import upstream_executor
+from app.services.cache_service import cache_service
+from app.services.circuit_breaker import breakers, CLOSED, OPEN, HALF_OPEN
+from app.services.fastf1_service import ergast_client
+from app.services.race_broadcaster import race_broadcaster
+from app.api.responses import NO_STORE
+
+router = APIRouter()
+
+# Service counters are kept by the services themselves and read on scrape
+
+def _executor_queue():
+    stats = upstream_executor.stats()
+    yield {"state": "queued"}, stats['queued']
+    yield {"state": "active"}, stats['active']
+
+def _executor_calls():
+    stats = upstream_executor.stats()
+    for outcome in ('completed', 'failed', 'timeouts', 'rejected'):
+        yield {"outcome": outcome}, stats[outcome]
+
+def _cache_tier_lookups():
+    stats = cache_service.stats()
+    yield {"tier": "l1", "result": "hit"}, stats['l1']['hits']
+    yield {"tier": "l1", "result": "miss"}, stats['l1']['misses']
+    yield {"tier": "l2", "result": "hit"}, stats['l2']['hits']
+    yield {"tier": "l2", "result": "miss"}, stats['l2']['misses']
+
+def _l1_usage():
+    stats = cache_service.stats()['l1']
+    yield {"unit": "entries"}, stats['entries']
+    yield {"unit": "bytes"}, stats['bytes']
+
+def _breaker_state():
+    for family, stats in breakers.stats().items():
+        for state in (CLOSED, OPEN, HALF_OPEN):
+            yield {"family": family, "state": state}, 1 if stats['state'] == state else 0
+
+def _breaker_counter(name: str):
+    def collect():
+        for family, stats in breakers.stats().items():
+            yield {"family": family}, stats[name]
+    return collect
+
+def _http_client_counter(name: str):
+    def collect():
+        yield {}, ergast_client.stats()[name]
+    return collect
+
+def _race_stream_clients():
+    yield {}, race_broadcaster.clients
+
+metrics.collect("executor_queue_depth", "Upstream executor calls waiting or running", "gauge", _executor_queue)
+metrics.collect("executor_calls_total", "Upstream executor calls by outcome", "counter", _executor_calls)
+metrics.collect("cache_tier_lookups_total", "Cache tier lookups by result", "counter", _cache_tier_lookups)
+metrics.collect("cache_l1_usage", "In-process cache size", "gauge", _l1_usage)
+metrics.collect("circuit_breaker_state", "Circuit breaker state by endpoint family (1 for the current state)", "gauge", _breaker_state)
+metrics.collect("circuit_breaker_trips_total", "Times a circuit opened", "counter", _breaker_counter('trips'))
+metrics.collect("circuit_breaker_rejected_total", "Calls failed fast by an open circuit", "counter", _breaker_counter('rejected'))
+metrics.collect("race_stream_clients", "Open next-race event streams", "gauge", _race_stream_clients)
+metrics.collect("upstream_http_requests_total", "HTTP requests sent upstream, retries included", "counter", _http_client_counter('requests'))
+metrics.collect("upstream_http_retries_total", "Upstream HTTP retries", "counter", _http_client_counter('retried'))
+metrics.collect("upstream_http_errors_total", "Upstream HTTP requests that failed after retrying", "counter", _http_client_counter('errors'))
+metrics.collect("upstream_rate_wait_seconds_total", "Time spent waiting for the upstream rate budget", "counter", _http_client_counter('throttled_seconds'))
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of request, cache and upstream metrics"""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE, headers={"Cache-Control": NO_STORE})
@@ -0,0 +1,40 @@
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from app.core.config import settings
+from app.services.profiler import profile_store, SORT_KEYS
+from app.api.responses import NO_STORE
+
+def require_profiling_token(request: Request):
+    """Profiles expose code paths; only callers holding the token may read them"""
+    token = request.headers.get("x-profile") or request.query_params.get("profile")
+    if not settings.profiling_token or token is None or not hmac.compare_digest(token, settings.profiling_token):
+        raise HTTPException(status_code=403, detail="Profiling token required")
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+@router.get("/")
+async def list_profiles(response: Response):
+    """Recent request profiles, newest first"""
+    response.headers["Cache-Control"] = NO_STORE
+    return {"profiles": profile_store.list(), **profile_store.stats()}
+
+@router.get("/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("text", pattern="^(text|prof)$"),
+    sort: str = Query("cumulative"),
+    limit: int = Query(40, ge=1, le=500)
+):
+    """A profile as a pstats text report, or as a .prof file for snakeviz/pstats"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+
+    headers = {"Cache-Control": NO_STORE}
+    if format == "prof":
+        headers["Content-Disposition"] = f'attachment; filename="{profile_id}.prof"'
+        return Response(content=profile.dump(), media_type="application/octet-stream", headers=headers)
+    header = f"{profile.method} {profile.path} -> {profile.status} in {profile.duration * 1000:.1f}ms\n\n"
+    return Response(content=header + profile.text(sort, limit), media_type="text/plain", headers=headers)
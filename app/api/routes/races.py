@@ -1,143 +1,253 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+import time
 from typing import Optional
-from app.models.schemas import RacesResponse, RaceResponse, NextRaceInfo
+from app.core.config import settings
+from app.models.schemas import RacesResponse, RaceResponse, NextRaceInfo, RaceResultResponse, SeasonResultsResponse
+from app.services import cache_keys, race_calendar
 from app.services.fastf1_service import fastf1_service
 from app.services.cache_service import cache_service
+from app.services.season_data import season_data
+from app.services.race_broadcaster import race_broadcaster
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.api.projection import Projection, projection_params
+from app.api.responses import NO_STORE, build_cached_response, cached_response, derived_response, upstream_unavailable
 
 router = APIRouter()
 
 @router.get("/", response_model=RacesResponse)
-async def get_races(season: Optional[int] = Query(None, description="Season year")):
+async def get_races(
+    request: Request,
+    season: Optional[int] = Query(None, description="Season year"),
+    projection: Projection = Depends(projection_params(RaceResponse))
+):
     """Get all races for a specific season"""
     try:
-        # Check cache first
-        cache_key = f"races:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return RacesResponse(**cached_data)
-        
-        # Fetch from FastF1
-        races_data = await fastf1_service.get_races(season)
-        
-        if not races_data:
+        season = cache_keys.resolve_season(season)
+        key = cache_keys.races_key(season)
+        tags = [
+            cache_keys.season_tag(season), "races", cache_keys.views_tag(key),
+            cache_keys.source_tag(cache_keys.races_data_key(season))
+        ]
+        
+        async def load_races():
+            # Fetch the cached season schedule
+            races_data = (await season_data.get_races(season)).value
+            if not races_data:
+                return None
+            if projection.view:
+                return build_cached_response({
+                    "races": projection.apply(races_data),
+                    "season": season,
+                    "total": len(races_data)
+                })
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(RacesResponse(
+                races=races_data,
+                season=season,
+                total=len(races_data)
+            ))
+        
+        # Concurrent misses share a single upstream fetch
+        result = await cache_service.get_or_set(cache_keys.view_key(key, projection.view), load_races, ttl=7200, tags=tags)  # 2 hours cache
+        
+        if not result.value:
             raise HTTPException(status_code=404, detail="No races found for this season")
         
-        response_data = {
-            "races": races_data,
-            "season": season or fastf1_service.current_season,
-            "total": len(races_data)
-        }
-        
-        # Cache the response
-        await cache_service.set(cache_key, response_data, ttl=7200)  # 2 hours cache
-        
-        return RacesResponse(**response_data)
-        
+        return cached_response(request, result, "races")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching races: {str(e)}")
 
 @router.get("/next", response_model=NextRaceInfo)
-async def get_next_race(season: Optional[int] = Query(None, description="Season year")):
+async def get_next_race(
+    request: Request,
+    season: Optional[int] = Query(None, description="Season year"),
+    session: str = Query("race", pattern=f"^({'|'.join(race_calendar.SESSIONS)})$", description="Session to count down to")
+):
     """Get the next upcoming race with countdown"""
     try:
-        # Check cache first (shorter TTL for next race as it changes frequently)
-        cache_key = f"next_race:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return NextRaceInfo(**cached_data)
-        
-        # Fetch next race
-        next_race = await fastf1_service.get_next_race(season)
-        
-        if not next_race:
+        season = cache_keys.resolve_season(season)
+        tags = [cache_keys.season_tag(season), "races", cache_keys.source_tag(cache_keys.races_data_key(season))]
+        
+        async def load_next_race():
+            # Bisect the season's sorted session starts, built once per schedule
+            _, timeline = await season_data.race_timeline(season)
+            now = time.time()
+            # A race that is running stays the next race until it should be over
+            live = timeline.live_race(now) if session == "race" else None
+            entry = live or timeline.next_session(now, session)
+            if not entry:
+                return None
+            start, _, race = entry
+            
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(NextRaceInfo(
+                race=race,
+                time_remaining=race_calendar.time_remaining(start, now),
+                is_live=live is not None,
+                session=session,
+                starts_at=time.strftime(race_calendar.SESSION_FORMAT, time.gmtime(start))
+            ))
+        
+        # Shorter TTL for next race as it changes frequently
+        result = await cache_service.get_or_set(
+            cache_keys.next_race_key(season, session), load_next_race, ttl=300, stale_ttl=300, tags=tags
+        )  # 5 minutes cache, 5 more stale
+        
+        if not result.value:
             raise HTTPException(status_code=404, detail="No upcoming races found")
         
-        # Calculate time remaining
-        time_remaining = await fastf1_service.calculate_time_remaining(next_race)
-        
-        response_data = {
-            "race": next_race,
-            "time_remaining": time_remaining,
-            "is_live": time_remaining.get('message') == 'Race is happening now!'
-        }
-        
-        # Cache the response (short TTL for next race)
-        await cache_service.set(cache_key, response_data, ttl=300)  # 5 minutes cache
-        
-        return NextRaceInfo(**response_data)
-        
+        return cached_response(request, result, "next_race")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching next race: {str(e)}")
 
+@router.get("/next/stream")
+async def stream_next_race():
+    """Server-Sent Events: the next race once, then each change (race started, next race changed)"""
+    if not settings.race_stream_enabled:
+        raise HTTPException(status_code=404, detail="Race stream is disabled")
+    if race_broadcaster.clients >= settings.race_stream_max_clients:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many open race streams",
+            headers={"Retry-After": str(settings.race_stream_keepalive), "Cache-Control": NO_STORE}
+        )
+    
+    return StreamingResponse(
+        race_broadcaster.events(),
+        media_type="text/event-stream",
+        # Proxies must neither cache nor buffer the stream
+        headers={"Cache-Control": NO_STORE, "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/results", response_model=SeasonResultsResponse)
+async def get_season_results(
+    request: Request,
+    season: Optional[int] = Query(None, description="Season year"),
+    projection: Projection = Depends(projection_params(RaceResultResponse))
+):
+    """Get the results of every completed race of a season"""
+    try:
+        season = cache_keys.resolve_season(season)
+        key = cache_keys.season_results_key(season)
+        tags = [
+            cache_keys.season_tag(season), "races", "results", cache_keys.views_tag(key),
+            cache_keys.source_tag(cache_keys.races_data_key(season))
+        ]
+        
+        async def load_season_results():
+            # Cached rounds in one batch, else a few paged season-level upstream requests
+            results = await season_data.get_season_results(season)
+            if not results:
+                return None
+            tags.extend(cache_keys.source_tag(cache_keys.race_results_data_key(season, round_num)) for round_num in results)
+            _, index = await season_data.race_index(season)
+            races = []
+            for round_num, round_results in sorted(results.items()):
+                race = index.get('round', round_num) or {}
+                races.append({
+                    'round': round_num,
+                    'raceId': race.get('raceId'),
+                    'raceName': race.get('raceName'),
+                    'results': projection.apply(round_results) if projection.view else round_results
+                })
+            if projection.view:
+                return build_cached_response({"season": season, "total": len(races), "races": races})
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(SeasonResultsResponse(season=season, total=len(races), races=races))
+        
+        # Results are corrected for a while after a race, then final
+        result = await cache_service.get_or_set(
+            cache_keys.view_key(key, projection.view), load_season_results, ttl=lambda: season_data.calendar_ttl(season), tags=tags
+        )
+        
+        if not result.value:
+            raise HTTPException(status_code=404, detail="No results found for this season")
+        
+        return cached_response(request, result, "season_results")
+    
+    except HTTPException:
+        raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching season results: {str(e)}")
+
 @router.get("/{race_id}", response_model=RaceResponse)
-async def get_race(race_id: str, season: Optional[int] = Query(None, description="Season year")):
+async def get_race(request: Request, race_id: str, season: Optional[int] = Query(None, description="Season year")):
     """Get specific race information"""
     try:
-        # Check cache first
-        cache_key = f"race:{race_id}:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return RaceResponse(**cached_data)
-        
-        # Fetch all races and find the specific one
-        races_data = await fastf1_service.get_races(season)
-        
-        race = next((r for r in races_data if r['raceId'] == race_id), None)
+        # Look the race up in the indexed season schedule
+        races, index = await season_data.race_index(season)
+        race = index.get('raceId', race_id)
         
         if not race:
             raise HTTPException(status_code=404, detail=f"Race {race_id} not found")
         
-        # Cache the response
-        await cache_service.set(cache_key, race, ttl=7200)  # 2 hours cache
-        
-        return RaceResponse(**race)
-        
+        return derived_response(request, races, index, race_id, lambda: RaceResponse(**race), "races")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching race: {str(e)}")
 
 @router.get("/{race_id}/results")
 async def get_race_results(
+    request: Request,
     race_id: str,
-    season: Optional[int] = Query(None, description="Season year")
+    season: Optional[int] = Query(None, description="Season year"),
+    projection: Projection = Depends(projection_params(RaceResultResponse))
 ):
     """Get race results for a specific race"""
     try:
-        # Check cache first
-        cache_key = f"race_results:{race_id}:{season or 'current'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        # Parse race_id to get round number
-        # Assuming race_id format: "2024_Australian_Grand_Prix"
-        races_data = await fastf1_service.get_races(season)
-        race = next((r for r in races_data if r['raceId'] == race_id), None)
+        # Resolve race_id (e.g. "2024_Australian Grand Prix") to its round
+        # through the indexed season schedule
+        races, index = await season_data.race_index(season)
+        race = index.get('raceId', race_id)
         
         if not race:
             raise HTTPException(status_code=404, detail=f"Race {race_id} not found")
         
-        # Get race results
-        results = await fastf1_service.get_race_results(race['season'], race['round'])
-        
-        if not results:
+        season, round_num = race['season'], race['round']
+        key = cache_keys.race_results_key(season, round_num)
+        tags = [
+            cache_keys.season_tag(season), cache_keys.round_tag(season, round_num), "results", cache_keys.views_tag(key),
+            cache_keys.source_tag(cache_keys.race_results_data_key(season, round_num))
+        ]
+        
+        async def load_race_results():
+            # Fetch the cached race results
+            results = (await season_data.get_race_results(season, round_num)).value
+            if not results:
+                return None
+            return build_cached_response(projection.apply(results) if projection.view else results)
+        
+        # Results are corrected for a while after a race, then final
+        result = await cache_service.get_or_set(
+            cache_keys.view_key(key, projection.view), load_race_results,
+            ttl=lambda: season_data.calendar_ttl(season), tags=tags
+        )
+        
+        if not result.value:
             raise HTTPException(status_code=404, detail="No results found for this race")
         
-        # Cache the response
-        await cache_service.set(cache_key, results, ttl=3600)  # 1 hour cache
-        
-        return results
-        
+        return cached_response(request, result, "race_results")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching race results: {str(e)}")
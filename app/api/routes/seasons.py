@@ -0,0 +1,85 @@
+import time
+from fastapi import APIRouter, HTTPException, Request
+from app.core.config import settings
+from app.models.schemas import SeasonBundleResponse
+from app.services import cache_keys, race_calendar
+from app.services.cache_service import cache_service
+from app.services.season_data import season_data
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.api.responses import build_cached_response, cached_response, upstream_unavailable
+
+router = APIRouter()
+
+@router.get("/{season}/bundle", response_model=SeasonBundleResponse)
+async def get_season_bundle(request: Request, season: int):
+    """Get drivers, standings, schedule and next race of a season in one response"""
+    try:
+        tags = [cache_keys.season_tag(season), "drivers", "races", "standings"] + [
+            cache_keys.source_tag(key) for key in (
+                cache_keys.drivers_data_key(season),
+                cache_keys.races_data_key(season),
+                cache_keys.standings_data_key(season)
+            )
+        ]
+        
+        async def load_bundle():
+            # One batched cache read; missing collections load concurrently
+            drivers, races, standings = await season_data.get_season(season)
+            if not drivers.value or not races.value:
+                return None
+            
+            # Each driver and constructor is sent once; standings refer to them by ID.
+            # Standings carry the current team, the drivers collection does not.
+            driver_table = {driver['driverId']: driver for driver in drivers.value}
+            constructor_table = {}
+            for standing in standings.value or []:
+                driver_table[standing['driver']['driverId']] = standing['driver']
+                constructor_table[standing['constructor']['constructorId']] = standing['constructor']
+            
+            # Start and end are sent rather than a countdown, which would be
+            # out of date for as long as the bundle stays cached
+            _, timeline = await season_data.race_timeline(season)
+            now = time.time()
+            next_race = timeline.live_race(now) or timeline.next_session(now)
+            next_race_info = None
+            if next_race:
+                start, _, race = next_race
+                next_race_info = {
+                    'raceId': race['raceId'],
+                    'startsAt': time.strftime(race_calendar.SESSION_FORMAT, time.gmtime(start)),
+                    'endsAt': time.strftime(race_calendar.SESSION_FORMAT, time.gmtime(start + settings.race_duration))
+                }
+            
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(SeasonBundleResponse(
+                season=season,
+                round=0,  # 0 indicates latest standings
+                drivers=driver_table,
+                constructors=constructor_table,
+                driverIds=[driver['driverId'] for driver in drivers.value],
+                standings=[{
+                    'position': standing['position'],
+                    'points': standing['points'],
+                    'wins': standing['wins'],
+                    'driverId': standing['driver']['driverId'],
+                    'constructorId': standing['constructor']['constructorId']
+                } for standing in standings.value or []],
+                races=races.value,
+                nextRace=next_race_info
+            ))
+        
+        result = await cache_service.get_or_set(
+            cache_keys.season_bundle_key(season), load_bundle, ttl=300, stale_ttl=300, tags=tags
+        )  # 5 minutes cache, 5 more stale
+        
+        if not result.value:
+            raise HTTPException(status_code=404, detail="No data found for this season")
+        
+        return cached_response(request, result, "bundle")
+    
+    except HTTPException:
+        raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching season bundle: {str(e)}")
@@ -1,76 +1,93 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 from app.models.schemas import StandingsResponse, DriverStandingResponse
-from app.services.fastf1_service import fastf1_service
+from app.services import cache_keys
 from app.services.cache_service import cache_service
+from app.services.season_data import season_data
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.api.projection import Projection, projection_params
+from app.api.responses import build_cached_response, cached_response, derived_response, upstream_unavailable
 
 router = APIRouter()
 
 @router.get("/", response_model=StandingsResponse)
 async def get_standings(
+    request: Request,
     season: Optional[int] = Query(None, description="Season year"),
-    round_num: Optional[int] = Query(None, description="Round number")
+    round_num: Optional[int] = Query(None, description="Round number"),
+    projection: Projection = Depends(projection_params(DriverStandingResponse))
 ):
     """Get driver standings for a specific season and round"""
     try:
-        # Check cache first
-        cache_key = f"standings:{season or 'current'}:{round_num or 'latest'}"
-        cached_data = await cache_service.get(cache_key)
+        season = cache_keys.resolve_season(season)
+        key = cache_keys.standings_key(season, round_num)
+        tags = [
+            cache_keys.season_tag(season), "standings", cache_keys.views_tag(key),
+            cache_keys.source_tag(cache_keys.standings_data_key(season, round_num))
+        ]
+        if round_num:
+            tags.append(cache_keys.round_tag(season, round_num))
         
-        if cached_data:
-            return StandingsResponse(**cached_data)
+        async def load_standings():
+            # Fetch the cached season standings
+            standings_data = (await season_data.get_standings(season, round_num)).value
+            if not standings_data:
+                return None
+            if projection.view:
+                return build_cached_response({
+                    "standings": projection.apply(standings_data),
+                    "season": season,
+                    "round": round_num or 0
+                })
+            # Validate and serialize once; cache hits return these bytes as-is
+            return build_cached_response(StandingsResponse(
+                standings=standings_data,
+                season=season,
+                round=round_num or 0  # 0 indicates latest standings
+            ))
         
-        # Fetch from FastF1
-        standings_data = await fastf1_service.get_standings(season, round_num)
+        # Concurrent misses share a single upstream fetch; standings change
+        # after races, so the TTL follows the season calendar
+        result = await cache_service.get_or_set(
+            cache_keys.view_key(key, projection.view), load_standings,
+            ttl=lambda: season_data.calendar_ttl(season), tags=tags
+        )
         
-        if not standings_data:
+        if not result.value:
             raise HTTPException(status_code=404, detail="No standings found for this season/round")
         
-        response_data = {
-            "standings": standings_data,
-            "season": season or fastf1_service.current_season,
-            "round": round_num or 0  # 0 indicates latest standings
-        }
-        
-        # Cache the response (shorter TTL for standings as they change more frequently)
-        await cache_service.set(cache_key, response_data, ttl=1800)  # 30 minutes cache
-        
-        return StandingsResponse(**response_data)
-        
+        return cached_response(request, result, "standings")
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching standings: {str(e)}")
 
 @router.get("/driver/{driver_id}", response_model=DriverStandingResponse)
 async def get_driver_standing(
+    request: Request,
     driver_id: str,
     season: Optional[int] = Query(None, description="Season year"),
     round_num: Optional[int] = Query(None, description="Round number")
 ):
     """Get specific driver's standing"""
     try:
-        # Check cache first
-        cache_key = f"driver_standing:{driver_id}:{season or 'current'}:{round_num or 'latest'}"
-        cached_data = await cache_service.get(cache_key)
-        
-        if cached_data:
-            return DriverStandingResponse(**cached_data)
-        
-        # Fetch all standings and find the specific driver
-        standings_data = await fastf1_service.get_standings(season, round_num)
-        
-        driver_standing = next((s for s in standings_data if s['driver']['driverId'] == driver_id), None)
+        # Look the driver up in the indexed season standings
+        standings, index = await season_data.standing_index(season, round_num)
+        driver_standing = index.get('driverId', driver_id)
         
         if not driver_standing:
             raise HTTPException(status_code=404, detail=f"Standing for driver {driver_id} not found")
         
-        # Cache the response
-        await cache_service.set(cache_key, driver_standing, ttl=1800)  # 30 minutes cache
-        
-        return DriverStandingResponse(**driver_standing)
-        
+        return derived_response(
+            request, standings, index, driver_id, lambda: DriverStandingResponse(**driver_standing), "standings"
+        )
+    
     except HTTPException:
         raise
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching driver standing: {str(e)}")
@@ -1,6 +1,5 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
-import os
 
 class Settings(BaseSettings):
     # API Configuration
@@ -12,12 +11,80 @@ class Settings(BaseSettings):
     
     # Cache Configuration
     redis_url: Optional[str] = "redis://localhost:6379"
+    redis_max_connections: int = 50  # shared async connection pool size
+    redis_socket_timeout: float = 2.0  # seconds for connect and each command
     cache_ttl: int = 3600  # 1 hour default cache TTL
+    cache_stale_ttl: int = 86400  # seconds a value may be served stale after its TTL
+    cache_refresh_retry_interval: int = 30  # seconds between refresh attempts after a failure
+    cache_negative_ttl: int = 60  # seconds a "not found" result is remembered
+    cache_tag_ttl: int = 7 * 86400  # seconds a tag index outlives its last write
+    l1_cache_max_entries: int = 1000  # in-process cache entry budget
+    l1_cache_max_bytes: int = 64 * 1024 * 1024  # in-process cache size budget
+    l1_cache_ttl: int = 60  # max seconds an L1 entry lives while Redis is the shared tier
+    cache_fill_lock_ttl: float = 10.0  # seconds a worker may hold a cache fill lock
+    cache_fill_poll_interval: float = 0.05  # seconds between polls while another worker fills
+    
+    # Response Cache Configuration
+    response_compress_min_size: int = 1024  # bodies smaller than this are not compressed
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 5
     
     # FastF1 Configuration
-    fastf1_cache_dir: str = "./cache"
     fastf1_verbose: bool = False
     
+    # Snapshot Configuration
+    snapshot_dir: str = "./snapshots"  # on-disk store for finalized seasons
+    snapshot_enabled: bool = True  # serve finalized seasons from snapshots when present
+    
+    # Upstream Executor Configuration
+    upstream_max_workers: int = 8  # threads for blocking Ergast/FastF1 calls
+    upstream_max_queue: int = 64  # calls allowed to wait for a free thread
+    upstream_timeout: float = 20.0  # seconds per upstream call
+    
+    # Upstream HTTP Configuration (Jolpica allows 4 requests/s and 500/hour)
+    upstream_rate_limit: float = 4.0  # requests per second
+    upstream_rate_burst: int = 4  # requests allowed back to back
+    upstream_hourly_limit: int = 500  # requests per hour; 0 disables the hourly budget
+    upstream_retries: int = 3  # retries after a connection error, 429 or 5xx
+    upstream_retry_backoff: float = 0.5  # seconds; doubles per retry, with full jitter
+    upstream_request_timeout: float = 5.0  # seconds per HTTP request
+    upstream_max_connections: int = 10  # pooled keep-alive connections
+    upstream_page_size: int = 100  # rows per request of paged season queries (Jolpica's maximum)
+    breaker_failure_threshold: int = 5  # consecutive failures that open an endpoint's circuit
+    breaker_reset_timeout: float = 30.0  # seconds an open circuit fails fast before a trial call
+    breaker_half_open_calls: int = 1  # trial calls allowed while half-open
+    
+    # Refresh Scheduler Configuration
+    refresh_scheduler_enabled: bool = True  # keep the current season warm in the background
+    refresh_prewarm: bool = True  # warm every supported season at startup
+    refresh_hot_interval: int = 300  # seconds between refreshes just after a race
+    refresh_hot_window: int = 6 * 3600  # seconds after a race the hot interval applies
+    refresh_weekend_interval: int = 1800  # seconds between refreshes in the run-up to a race
+    refresh_weekend_lead: int = 3 * 86400  # seconds before a race end that count as race weekend
+    refresh_idle_interval: int = 6 * 3600  # seconds between refreshes otherwise
+    refresh_finalized_interval: int = 86400  # seconds between refreshes of past seasons
+    race_duration: int = 2 * 3600  # seconds from race start until results are expected
+    
+    # Next Race Stream Configuration (/api/races/next/stream)
+    race_stream_enabled: bool = True
+    race_stream_max_clients: int = 5000  # open streams per worker; more are refused with 503
+    race_stream_keepalive: int = 15  # seconds between keep-alive comments
+    race_stream_max_duration: int = 900  # seconds before a stream ends and the client reconnects
+    race_stream_check_interval: int = 300  # seconds between schedule re-checks
+    
+    # Health Probe Configuration
+    health_probe_interval: int = 30  # seconds between background freshness checks
+    health_upstream_probe_interval: int = 900  # seconds between upstream checks; each one spends an Ergast request
+    
+    # Metrics Configuration
+    metrics_enabled: bool = True  # record request/cache/upstream metrics and serve /metrics
+    
+    # Profiling Configuration (off by default; the middleware is not installed unless enabled)
+    profiling_enabled: bool = False
+    profiling_token: Optional[str] = None  # X-Profile header / ?profile= value that profiles a request
+    profiling_sample_rate: float = 0.0  # share of requests profiled without the token, e.g. 0.001
+    profiling_max_profiles: int = 20  # profiles kept in memory for download
+    
     # Data Configuration
     current_season: int = 2025
     supported_seasons: list = [2020, 2021, 2022, 2023, 2024, 2025]
@@ -27,6 +94,3 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 settings = Settings()
-
-# Ensure cache directory exists
-os.makedirs(settings.fastf1_cache_dir, exist_ok=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 # Driver Models
@@ -52,16 +52,48 @@ class RaceBase(BaseModel):
     locality: str
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    sessions: Optional[Dict[str, str]] = None  # UTC session starts, e.g. {"fp1": "2025-03-14T01:30:00Z"}
 
 class RaceResponse(RaceBase):
     class Config:
         populate_by_name = True
 
+# Race Result Models
+class ResultDriver(BaseModel):
+    driver_id: str = Field(..., alias="driverId")
+    given_name: str = Field(..., alias="givenName")
+    family_name: str = Field(..., alias="familyName")
+    nationality: str
+
+class ResultConstructor(BaseModel):
+    constructor_id: str = Field(..., alias="constructorId")
+    name: str
+
+class RaceResultResponse(BaseModel):
+    position: Optional[int] = None
+    driver: ResultDriver
+    constructor: ResultConstructor
+    status: str
+    points: float
+
+class RoundResults(BaseModel):
+    round: int
+    race_id: Optional[str] = Field(None, alias="raceId")
+    race_name: Optional[str] = Field(None, alias="raceName")
+    results: List[RaceResultResponse]
+
+class SeasonResultsResponse(BaseModel):
+    season: int
+    total: int  # rounds with results
+    races: List[RoundResults]
+
 # Next Race Models
 class NextRaceInfo(BaseModel):
     race: RaceResponse
     time_remaining: dict
     is_live: bool = False
+    session: str = "race"  # session counted down to
+    starts_at: Optional[str] = None  # its UTC start
 
 # API Response Models
 class DriversResponse(BaseModel):
@@ -79,9 +111,52 @@ class RacesResponse(BaseModel):
     season: int
     total: int
 
+# Season Bundle Models: drivers and constructors appear once, in the
+# tables, and are referenced by ID everywhere else
+class BundleStanding(BaseModel):
+    position: int
+    points: float
+    wins: int
+    driver_id: str = Field(..., alias="driverId")
+    constructor_id: str = Field(..., alias="constructorId")
+
+class BundleNextRace(BaseModel):
+    # Absolute UTC times; clients count down and tell a live race from them
+    race_id: str = Field(..., alias="raceId")
+    starts_at: str = Field(..., alias="startsAt")
+    ends_at: str = Field(..., alias="endsAt")  # when results are expected
+
+class SeasonBundleResponse(BaseModel):
+    season: int
+    round: int  # round of the standings, 0 for latest
+    drivers: Dict[str, DriverResponse]
+    constructors: Dict[str, ConstructorResponse]
+    driver_ids: List[str] = Field(..., alias="driverIds")  # season entry list, in drivers-route order
+    standings: List[BundleStanding]
+    races: List[RaceResponse]
+    next_race: Optional[BundleNextRace] = Field(None, alias="nextRace")
+
 # Health Check Model
 class HealthResponse(BaseModel):
     status: str
     timestamp: datetime
     version: str
     fastf1_status: str
+    executor: Optional[dict] = None
+    cache: Optional[dict] = None
+
+class LivenessResponse(BaseModel):
+    status: str
+    timestamp: datetime
+    version: str
+
+class ReadinessResponse(BaseModel):
+    status: str  # ready, degraded (upstream down, cache still served) or starting
+    timestamp: datetime
+    version: str
+    upstream: dict
+    cache: dict
+    executor: dict
+    seasons: dict
+    scheduler: dict
+    breakers: dict
@@ -0,0 +1,76 @@
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Payload layout: MAGIC | header length (4 bytes, big endian) | JSON header | blobs
+# The header is the cached value as JSON, with every CachedResponse replaced
+# by a reference to its byte variants in the blob section. Nothing is ever
+# unpickled, so a tampered Redis payload cannot execute code.
+MAGIC = b"FHC1"
+_HEADER_LEN = struct.Struct(">I")
+_RESPONSE_TAG = "__response__"
+
+@dataclass
+class CachedResponse:
+    """A fully serialized response body with its compressed variants"""
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    # Content-Encoding -> compressed body, e.g. {"gzip": b"...", "br": b"..."}
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.encodings.values())
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON-compatible value that may contain CachedResponses"""
+    blobs: List[bytes] = []
+    offset = 0
+
+    def add_blob(data: bytes) -> List[int]:
+        nonlocal offset
+        ref = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+        return ref
+
+    def default(obj):
+        if isinstance(obj, CachedResponse):
+            return {_RESPONSE_TAG: {
+                'etag': obj.etag,
+                'media_type': obj.media_type,
+                'body': add_blob(obj.body),
+                'encodings': {name: add_blob(data) for name, data in obj.encodings.items()}
+            }}
+        raise TypeError(f"Object of type {type(obj).__name__} is not cacheable")
+
+    header = json.dumps(value, default=default, separators=(",", ":")).encode("utf-8")
+    return b"".join([MAGIC, _HEADER_LEN.pack(len(header)), header, *blobs])
+
+def loads(payload: bytes) -> Optional[Any]:
+    """Inverse of dumps; returns None for payloads in an unknown format"""
+    if not payload.startswith(MAGIC):
+        return None
+    start = len(MAGIC) + _HEADER_LEN.size
+    (header_len,) = _HEADER_LEN.unpack_from(payload, len(MAGIC))
+    blob_start = start + header_len
+    view = memoryview(payload)
+
+    def blob(ref: List[int]) -> bytes:
+        begin = blob_start + ref[0]
+        return bytes(view[begin:begin + ref[1]])
+
+    def object_hook(obj: dict):
+        spec = obj.get(_RESPONSE_TAG)
+        if spec is not None and len(obj) == 1:
+            return CachedResponse(
+                body=blob(spec['body']),
+                etag=spec['etag'],
+                media_type=spec['media_type'],
+                encodings={name: blob(ref) for name, ref in spec['encodings'].items()}
+            )
+        return obj
+
+    return json.loads(view[start:blob_start].tobytes(), object_hook=object_hook)
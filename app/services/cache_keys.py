@@ -0,0 +1,76 @@
+from typing import Optional
+from app.core.config import settings
+
+# Canonical cache keys. Every key names a concrete season, so a request
+# without ?season= and one for the current season share the same entry.
+
+def resolve_season(season: Optional[int]) -> int:
+    """Concrete season for a request; None means the current season"""
+    return season or settings.current_season
+
+def resolve_round(round_num: Optional[int]) -> str:
+    """Round part of a key; None or 0 means the latest round"""
+    return str(round_num) if round_num else "latest"
+
+def key_family(key: str) -> str:
+    """Key without its season/round parts, e.g. data:standings; used as a metrics label"""
+    prefix, _, rest = key.partition(":")
+    if prefix == "data":
+        return f"data:{rest.partition(':')[0]}"
+    return prefix
+
+# Tags
+def season_tag(season: int) -> str:
+    return f"season:{season}"
+
+def round_tag(season: int, round_num: int) -> str:
+    return f"round:{season}:{round_num}"
+
+def views_tag(key: str) -> str:
+    """Every rendering of one response: the full body and its projections"""
+    return f"views:{key}"
+
+def source_tag(key: str) -> str:
+    """Every rendered response built from one data:* entry; dropped when it is replaced"""
+    return f"source:{key}"
+
+# Season collections, shared by list and single-entity routes
+def drivers_data_key(season: int) -> str:
+    return f"data:drivers:{season}"
+
+def races_data_key(season: int) -> str:
+    return f"data:races:{season}"
+
+def standings_data_key(season: int, round_num: Optional[int] = None) -> str:
+    return f"data:standings:{season}:{resolve_round(round_num)}"
+
+def race_results_data_key(season: int, round_num: int) -> str:
+    return f"data:results:{season}:{round_num}"
+
+# Rendered responses
+def drivers_key(season: int) -> str:
+    return f"drivers:{season}"
+
+def races_key(season: int) -> str:
+    return f"races:{season}"
+
+def next_race_key(season: int, session: str = "race") -> str:
+    if session == "race":
+        return f"next_race:{season}"
+    return f"next_race:{season}:{session}"
+
+def standings_key(season: int, round_num: Optional[int] = None) -> str:
+    return f"standings:{season}:{resolve_round(round_num)}"
+
+def race_results_key(season: int, round_num: int) -> str:
+    return f"race_results:{season}:{round_num}"
+
+def season_results_key(season: int) -> str:
+    return f"season_results:{season}"
+
+def season_bundle_key(season: int) -> str:
+    return f"bundle:{season}"
+
+def view_key(key: str, view: Optional[str]) -> str:
+    """Key of a projected rendering (?fields=/?format=) of a response"""
+    return f"{key}?{view}" if view else key
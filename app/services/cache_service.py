@@ -1,77 +1,224 @@
-import redis
-import json
-import pickle
-from typing import Any, Optional
-from datetime import timedelta
+import redis.asyncio as aioredis
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 import logging
 from app.core.config import settings
+from app.services import cache_codec
+from app.services.cache_keys import key_family, source_tag
+from app.services.metrics import cache_lookups
+from app.services.memory_cache import MemoryCache
+from app.services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Seconds, or an async callable returning them; a callable is only awaited
+# when an entry is filled, so cache hits do not pay for working the TTL out
+TTL = Union[int, Callable[[], Awaitable[int]]]
+
+@dataclass
+class CacheResult:
+    """Value returned by get_or_set, with how it was served"""
+    value: Any
+    hit: bool = True
+    stale: bool = False
+    age: float = 0.0  # seconds since the value was fetched upstream
+    stored_at: float = 0.0  # epoch time the value was fetched upstream
+    degraded: bool = False  # the last refresh failed; value is kept from before
+
 class CacheService:
     def __init__(self):
+        # Redis (L2) is connected from the app lifespan; until then (or if it
+        # is unreachable) the in-process L1 cache is the only tier.
+        self.redis_client: Optional[aioredis.Redis] = None
+        self.connected = False
+        self._l1 = MemoryCache(
+            max_entries=settings.l1_cache_max_entries,
+            max_bytes=settings.l1_cache_max_bytes
+        )
+        self._flights = SingleFlight()
+        self._background = set()
+        self.l2_hits = 0
+        self.l2_misses = 0
+    
+    async def connect(self) -> bool:
+        """Connect to Redis on a shared connection pool"""
+        if self.connected or not settings.redis_url:
+            return self.connected
+        
+        client = None
         try:
-            self.redis_client = redis.from_url(settings.redis_url)
-            self.redis_client.ping()  # Test connection
+            pool = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=settings.redis_max_connections,
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_socket_timeout
+            )
+            client = aioredis.Redis(connection_pool=pool)
+            await asyncio.wait_for(client.ping(), settings.redis_socket_timeout)  # Test connection
+            self.redis_client = client
             self.connected = True
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
+            if client is not None:
+                await client.aclose()
             self.redis_client = None
             self.connected = False
-            self._memory_cache = {}
+        return self.connected
+    
+    async def close(self):
+        """Close the Redis connection pool"""
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+        self.redis_client = None
+        self.connected = False
+    
+    def _l1_ttl(self, ttl: float) -> float:
+        """TTL for an L1 entry; capped while Redis is shared with other workers"""
+        if self.connected:
+            return min(ttl, settings.l1_cache_ttl)
+        return ttl
+    
+    def _fill_l1(self, key: str, raw: bytes, pttl: int) -> Optional[Any]:
+        value = cache_codec.loads(raw)
+        if value is None:
+            # Payload written in an older format, treat it as a miss
+            return None
+        # PTTL is -1 for keys without expiry
+        ttl = pttl / 1000 if pttl and pttl > 0 else settings.cache_ttl
+        self._l1.set(key, value, self._l1_ttl(ttl), size=len(raw))
+        return value
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
+        value = self._l1.get(key)
+        if value is not None or not (self.connected and self.redis_client):
+            return value
+        
         try:
-            if self.connected and self.redis_client:
-                value = self.redis_client.get(key)
-                if value:
-                    return pickle.loads(value)
-            else:
-                # Fallback to memory cache
-                if key in self._memory_cache:
-                    item = self._memory_cache[key]
-                    if item['expires_at'] > timedelta(seconds=0):
-                        return item['value']
-                    else:
-                        del self._memory_cache[key]
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                raw, pttl = await pipe.execute()
+            value = self._fill_l1(key, raw, pttl) if raw else None
+            if value is not None:
+                self.l2_hits += 1
+                return value
+            self.l2_misses += 1
         except Exception as e:
             logger.error(f"Cache get error: {e}")
         return None
     
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
-        """Set value in cache with TTL"""
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values in one round trip; missing keys are left out"""
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._l1.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        if not missing or not (self.connected and self.redis_client):
+            return found
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.mget(missing)
+                for key in missing:
+                    pipe.pttl(key)
+                raws, *pttls = await pipe.execute()
+            for key, raw, pttl in zip(missing, raws, pttls):
+                value = self._fill_l1(key, raw, pttl) if raw else None
+                if value is not None:
+                    self.l2_hits += 1
+                    found[key] = value
+                else:
+                    self.l2_misses += 1
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+        return found
+    
+    async def peek_many(self, keys: List[str]) -> Dict[str, dict]:
+        """Timestamps of get_or_set entries (stored_at, fresh_until), for monitoring.
+        
+        Unlike get_many this leaves L1 alone: nothing is promoted, filled
+        or counted as a hit. Missing keys are left out.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            entry = self._l1.peek(key)
+            if entry is not None:
+                found[key] = entry
+            else:
+                missing.append(key)
+        if missing and self.connected and self.redis_client:
+            try:
+                for key, raw in zip(missing, await self.redis_client.mget(missing)):
+                    entry = cache_codec.loads(raw) if raw else None
+                    if entry is not None:
+                        found[key] = entry
+            except Exception as e:
+                logger.error(f"Cache peek_many error: {e}")
+        return {
+            key: {'stored_at': entry['stored_at'], 'fresh_until': entry['fresh_until']}
+            for key, entry in found.items()
+        }
+    
+    async def set(self, key: str, value: Any, ttl: int = None, tags: Iterable[str] = ()) -> bool:
+        """Set value in cache with TTL, registered under the given tags"""
         if ttl is None:
             ttl = settings.cache_ttl
-            
+        tags = list(tags)
+        
         try:
+            payload = cache_codec.dumps(value)
+            self._l1.set(key, value, self._l1_ttl(ttl), size=len(payload), tags=tags)
             if self.connected and self.redis_client:
-                return self.redis_client.setex(
-                    key, 
-                    ttl, 
-                    pickle.dumps(value)
-                )
-            else:
-                # Fallback to memory cache
-                self._memory_cache[key] = {
-                    'value': value,
-                    'expires_at': timedelta(seconds=ttl)
-                }
-                return True
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, ttl, payload)
+                    for tag in tags:
+                        pipe.sadd(self._tag_key(tag), key)
+                        pipe.expire(self._tag_key(tag), settings.cache_tag_ttl)
+                    results = await pipe.execute()
+                return bool(results[0])
+            return True
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             return False
     
+    async def set_many(self, items: Dict[str, Any], ttl: int = None) -> bool:
+        """Set several values with the same TTL in one pipelined round trip"""
+        if not items:
+            return True
+        if ttl is None:
+            ttl = settings.cache_ttl
+        
+        try:
+            payloads = {}
+            for key, value in items.items():
+                payloads[key] = cache_codec.dumps(value)
+                self._l1.set(key, value, self._l1_ttl(ttl), size=len(payloads[key]))
+            if self.connected and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, payload in payloads.items():
+                        pipe.setex(key, ttl, payload)
+                    results = await pipe.execute()
+                return all(results)
+            return True
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+            return False
+    
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
+            deleted = self._l1.delete(key)
             if self.connected and self.redis_client:
-                return bool(self.redis_client.delete(key))
-            else:
-                # Fallback to memory cache
-                if key in self._memory_cache:
-                    del self._memory_cache[key]
-                    return True
+                return bool(await self.redis_client.delete(key))
+            return deleted
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
         return False
@@ -79,32 +226,340 @@ class CacheService:
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         try:
+            if self._l1.contains(key):
+                return True
             if self.connected and self.redis_client:
-                return bool(self.redis_client.exists(key))
-            else:
-                return key in self._memory_cache
+                return bool(await self.redis_client.exists(key))
+            return False
         except Exception as e:
             logger.error(f"Cache exists error: {e}")
         return False
     
     async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+        """Clear all keys matching a glob pattern.
+        
+        Walks the keyspace with SCAN, which does not block Redis the way
+        KEYS does, but is still O(keyspace); prefer invalidate_tags.
+        """
         try:
+            count = self._l1.delete_pattern(pattern)
             if self.connected and self.redis_client:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    return self.redis_client.delete(*keys)
-            else:
-                # Fallback to memory cache
                 count = 0
-                keys_to_delete = [k for k in self._memory_cache.keys() if pattern in k]
-                for key in keys_to_delete:
-                    del self._memory_cache[key]
-                    count += 1
-                return count
+                batch = []
+                async for key in self.redis_client.scan_iter(match=pattern, count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        count += await self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    count += await self.redis_client.unlink(*batch)
+            return count
         except Exception as e:
             logger.error(f"Cache clear pattern error: {e}")
         return 0
+    
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry registered under any of the tags.
+        
+        Costs O(members) per tag. Other workers drop their L1 copies
+        when those expire (at most l1_cache_ttl seconds).
+        """
+        if not tags:
+            return 0
+        try:
+            count = sum(self._l1.delete_tag(tag) for tag in tags)
+            if self.connected and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for tag in tags:
+                        pipe.smembers(self._tag_key(tag))
+                    member_sets = await pipe.execute()
+                keys = set()
+                for members in member_sets:
+                    keys.update(members)
+                for key in keys:
+                    # L1 copies that were read back from Redis carry no tags
+                    self._l1.delete(key.decode() if isinstance(key, bytes) else key)
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    if keys:
+                        pipe.unlink(*keys)
+                    pipe.unlink(*(self._tag_key(tag) for tag in tags))
+                    results = await pipe.execute()
+                count = results[0] if keys else 0
+            return count
+        except Exception as e:
+            logger.error(f"Cache invalidate tags error: {e}")
+        return 0
+    
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: TTL = None,
+        stale_ttl: int = None,
+        tags: List[str] = None,
+        negative_ttl: int = None
+    ) -> CacheResult:
+        """Get value from cache, filling it with a single loader call on a miss.
+        
+        Entries are fresh for ttl seconds and then served stale for up to
+        stale_ttl more seconds while a background refresh runs. A failed
+        refresh keeps the last good value. Concurrent fills for the same key
+        share one loader call in this process; with Redis, a short fill lock
+        coalesces other workers too. A falsy loader result on a miss is
+        cached as a miss for negative_ttl seconds, so repeated lookups of
+        unknown data do not reach upstream; it never replaces a good value.
+        
+        tags is read after the loader runs, so a loader may append tags it
+        only learns while fetching (e.g. the round of a race). Likewise a
+        callable ttl is only awaited once the loader has returned a value.
+        """
+        if ttl is None:
+            ttl = settings.cache_ttl
+        if stale_ttl is None:
+            stale_ttl = settings.cache_stale_ttl
+        if tags is None:
+            tags = []
+        if negative_ttl is None:
+            negative_ttl = settings.cache_negative_ttl
+        
+        entry = await self.get(key)
+        if entry is not None:
+            now = time.time()
+            age = now - entry['stored_at']
+            if now < entry['fresh_until']:
+                cache_lookups.inc(key_family(key), "hit")
+                return CacheResult(entry['value'], age=age, stored_at=entry['stored_at'])
+            # Serve the stale value now and refresh it in the background
+            cache_lookups.inc(key_family(key), "stale")
+            if now >= entry.get('retry_at', 0):
+                self._refresh_in_background(key, loader, ttl, stale_ttl, tags, entry)
+            return CacheResult(
+                entry['value'], stale=True, age=age, stored_at=entry['stored_at'], degraded='retry_at' in entry
+            )
+        
+        cache_lookups.inc(key_family(key), "miss")
+        entry = await self._flights.do(key, lambda: self._fill(key, loader, ttl, stale_ttl, tags, negative_ttl))
+        if entry is None:
+            return CacheResult(None, hit=False)
+        return CacheResult(entry['value'], hit=False, stored_at=entry['stored_at'])
+    
+    async def put_many(
+        self,
+        values: Dict[str, Any],
+        tags: Dict[str, List[str]],
+        ttl: int = None,
+        stale_ttl: int = None
+    ) -> bool:
+        """Store several values as fresh get_or_set entries, e.g. the parts of one bulk fetch.
+        
+        tags maps each key to its tags. With Redis this is one pipelined
+        round trip; get_or_set then serves the entries as hits.
+        """
+        if not values:
+            return True
+        if ttl is None:
+            ttl = settings.cache_ttl
+        if stale_ttl is None:
+            stale_ttl = settings.cache_stale_ttl
+        
+        try:
+            now = time.time()
+            payloads = {}
+            for key, value in values.items():
+                entry = {
+                    'value': value,
+                    'stored_at': now,
+                    'fresh_until': now + ttl,
+                    'expires_at': now + ttl + stale_ttl
+                }
+                payloads[key] = cache_codec.dumps(entry)
+                self._l1.set(key, entry, self._l1_ttl(ttl + stale_ttl), size=len(payloads[key]), tags=tags.get(key, []))
+            if self.connected and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, payload in payloads.items():
+                        pipe.setex(key, ttl + stale_ttl, payload)
+                        for tag in tags.get(key, []):
+                            pipe.sadd(self._tag_key(tag), key)
+                            pipe.expire(self._tag_key(tag), settings.cache_tag_ttl)
+                    await pipe.execute()
+            await self._invalidate_sources(values)
+            return True
+        except Exception as e:
+            logger.error(f"Cache put_many error: {e}")
+            return False
+    
+    def cached_result(self, key: str, entry: Optional[dict]) -> Optional[CacheResult]:
+        """CacheResult for an entry read with get_many, if it is still fresh.
+        
+        Missing and stale entries give None; load those with get_or_set,
+        which fills or refreshes them.
+        """
+        if entry is None:
+            return None
+        now = time.time()
+        if now >= entry['fresh_until']:
+            return None
+        cache_lookups.inc(key_family(key), "hit")
+        return CacheResult(entry['value'], age=now - entry['stored_at'], stored_at=entry['stored_at'])
+    
+    async def refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: TTL = None,
+        stale_ttl: int = None,
+        tags: List[str] = None,
+        min_age: float = 0
+    ) -> Optional[CacheResult]:
+        """Reload a key now, unless its entry is younger than min_age seconds.
+        
+        Used by scheduled refreshes; min_age lets several workers share one
+        refresh. An empty or failed load keeps the current value. Returns
+        the new value, or None when nothing was refreshed.
+        """
+        if ttl is None:
+            ttl = settings.cache_ttl
+        if stale_ttl is None:
+            stale_ttl = settings.cache_stale_ttl
+        if tags is None:
+            tags = []
+        
+        entry = await self.get(key)
+        if entry is not None and entry['value'] and time.time() - entry['stored_at'] < min_age:
+            return None
+        try:
+            entry = await self._flights.do(key, lambda: self._fill(key, loader, ttl, stale_ttl, tags))
+        except Exception as e:
+            logger.warning(f"Refresh of {key} failed: {e}")
+            return None
+        if entry is None or not entry['value']:
+            return None
+        return CacheResult(entry['value'], hit=False, stored_at=entry['stored_at'])
+    
+    def _refresh_in_background(self, key: str, loader, ttl: TTL, stale_ttl: int, tags: List[str], stale_entry: dict):
+        task = asyncio.ensure_future(self._refresh(key, loader, ttl, stale_ttl, tags, stale_entry))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    async def _refresh(self, key: str, loader, ttl: TTL, stale_ttl: int, tags: List[str], stale_entry: dict):
+        entry = None
+        try:
+            entry = await self._flights.do(key, lambda: self._fill(key, loader, ttl, stale_ttl, tags))
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        if entry is not None and entry['value']:
+            return
+        
+        # Keep serving the last good value, but hold off retrying for a while
+        now = time.time()
+        remaining = int(stale_entry['expires_at'] - now)
+        if remaining > 0:
+            retry_entry = dict(stale_entry, retry_at=now + settings.cache_refresh_retry_interval)
+            await self.set(key, retry_entry, remaining, tags=tags)
+    
+    async def _fill(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: TTL,
+        stale_ttl: int,
+        tags: List[str],
+        negative_ttl: int = 0
+    ) -> Optional[dict]:
+        lock = await self._acquire_fill_lock(key)
+        if lock is False:
+            # Another worker is already fetching this key, wait for its result
+            entry = await self._wait_for_fill(key)
+            if entry is not None:
+                return entry
+            lock = None
+        
+        try:
+            value = await loader()
+            if value and callable(ttl):
+                ttl = await ttl()
+            now = time.time()
+            if not value:
+                if not negative_ttl:
+                    return None
+                # Remember the miss briefly so unknown lookups stay off upstream
+                entry = {
+                    'value': None,
+                    'stored_at': now,
+                    'fresh_until': now + negative_ttl,
+                    'expires_at': now + negative_ttl
+                }
+                await self.set(key, entry, negative_ttl, tags=tags)
+                return entry
+            entry = {
+                'value': value,
+                'stored_at': now,
+                'fresh_until': now + ttl,
+                'expires_at': now + ttl + stale_ttl
+            }
+            await self.set(key, entry, ttl + stale_ttl, tags=tags)
+            await self._invalidate_sources([key])
+            return entry
+        finally:
+            if lock:
+                await self._release_fill_lock(lock)
+    
+    async def _invalidate_sources(self, keys: Iterable[str]):
+        """Drop responses rendered from data:* entries that were just replaced.
+        
+        A rendering keeps its own TTL, so without this one built from a stale
+        collection would stay fresh for a full TTL after the refresh.
+        """
+        await self.invalidate_tags(*(source_tag(key) for key in keys if key.startswith("data:")))
+    
+    async def _acquire_fill_lock(self, key: str):
+        """Take the cross-worker fill lock; None when there is no Redis"""
+        if not (self.connected and self.redis_client):
+            return None
+        try:
+            lock = self.redis_client.lock(
+                f"lock:{key}",
+                timeout=settings.cache_fill_lock_ttl,
+                blocking=False
+            )
+            return lock if await lock.acquire() else False
+        except Exception as e:
+            logger.error(f"Cache fill lock error: {e}")
+            return None
+    
+    async def _release_fill_lock(self, lock):
+        try:
+            await lock.release()
+        except Exception as e:
+            # The lock expired before the fill finished
+            logger.warning(f"Cache fill lock release error: {e}")
+    
+    async def _wait_for_fill(self, key: str) -> Optional[dict]:
+        """Poll the cache until the lock holder stores a fresh entry or gives up"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.cache_fill_lock_ttl
+        while loop.time() < deadline:
+            await asyncio.sleep(settings.cache_fill_poll_interval)
+            entry = await self.get(key)
+            if entry is not None and entry['fresh_until'] > time.time():
+                return entry
+            if not await self.exists(f"lock:{key}"):
+                # Lock released without a value, the other fill failed
+                break
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for both cache tiers"""
+        return {
+            'backend': 'redis' if self.connected else 'memory',
+            'l1': self._l1.stats(),
+            'l2': {'hits': self.l2_hits, 'misses': self.l2_misses}
+        }
 
 # Global cache instance
 cache_service = CacheService()
@@ -0,0 +1,154 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+from app.core.config import settings
+from app.services.executor import UpstreamBusyError
+from app.services.upstream_client import RateBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Local overload, not a sign of upstream health
+LOCAL_ERRORS = (UpstreamBusyError, RateBudgetExceeded)
+
+class UpstreamUnavailableError(Exception):
+    """Raised when upstream data could not be fetched"""
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised without calling upstream while a breaker is open"""
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker around one upstream endpoint family.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    fail immediately for reset_timeout seconds. It then lets half_open_calls
+    trial calls through: a success closes it, a failure opens it again.
+    Errors listed in ignore pass through without counting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_calls: int = 1,
+        ignore: Tuple[Type[Exception], ...] = LOCAL_ERRORS
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.ignore = ignore
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._trial_calls = 0
+
+        # Metrics
+        self.trips = 0
+        self.rejected = 0
+        self.failures = 0
+        self.successes = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_calls = 0
+        return self._state
+
+    def _allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._trial_calls < self.half_open_calls:
+            self._trial_calls += 1
+            return True
+        return False
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_calls = 0
+        self.trips += 1
+        logger.warning(f"Circuit {self.name} opened after {self._consecutive_failures} consecutive failures")
+
+    def _on_failure(self):
+        self.failures += 1
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _release_trial(self):
+        # The call proved nothing either way; let another trial through
+        if self._state == HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def _on_success(self):
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self._state != CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self._state = CLOSED
+        self._trial_calls = 0
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) unless the breaker is open"""
+        if not self._allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"Upstream {self.name} unavailable (circuit open)")
+        try:
+            result = await func(*args, **kwargs)
+        except self.ignore:
+            self._release_trial()
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        except BaseException:
+            # Cancelled, e.g. the caller went away or the app is shutting down
+            self._release_trial()
+            raise
+        self._on_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'trips': self.trips,
+            'rejected': self.rejected,
+            'failures': self.failures,
+            'successes': self.successes
+        }
+
+class BreakerRegistry:
+    """One breaker per upstream endpoint family, created on first use"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_timeout=settings.breaker_reset_timeout,
+                half_open_calls=settings.breaker_half_open_calls
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+    def degraded(self, name: Optional[str]) -> bool:
+        """Whether a family is currently not served by upstream"""
+        breaker = self._breakers.get(name) if name else None
+        return breaker is not None and breaker.state != CLOSED
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.stats() for name, breaker in sorted(self._breakers.items())}
+
+# Global instance
+breakers = BreakerRegistry()
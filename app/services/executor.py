@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class UpstreamTimeoutError(Exception):
+    """Raised when an upstream call does not finish within its timeout"""
+
+class UpstreamBusyError(Exception):
+    """Raised when the upstream queue is full and a call is rejected"""
+
+class UpstreamExecutor:
+    """Bounded thread pool that keeps blocking upstream calls off the event loop"""
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Queue-depth metrics
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="upstream"
+            )
+        return self._pool
+
+    def _wrap(self, func: Callable, args: tuple, kwargs: dict) -> Callable:
+        def runner():
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                raise
+            else:
+                with self._lock:
+                    self._completed += 1
+                return result
+            finally:
+                with self._lock:
+                    self._active -= 1
+        return runner
+
+    def _on_done(self, future):
+        # A call cancelled before a worker picked it up (timeout, cancelled
+        # caller, shutdown) never runs the runner, so dequeue it here
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, func: Callable, *args, timeout: float = None, **kwargs) -> Any:
+        """Run a blocking callable in the pool and await its result"""
+        if timeout is None:
+            timeout = self.timeout
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise UpstreamBusyError(
+                    f"Upstream queue full ({self._queued} pending calls)"
+                )
+            self._queued += 1
+
+        future = self._get_pool().submit(self._wrap(func, args, kwargs))
+        future.add_done_callback(self._on_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # A call that never started can be dropped; a running one is left
+            # to finish in its thread, its result is simply discarded.
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            name = getattr(func, "__name__", repr(func))
+            logger.warning(f"Upstream call {name} timed out after {timeout}s")
+            raise UpstreamTimeoutError(f"{name} timed out after {timeout}s")
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of pool size and queue-depth counters"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queued': self._queued,
+                'active': self._active,
+                'completed': self._completed,
+                'failed': self._failed,
+                'timeouts': self._timeouts,
+                'rejected': self._rejected
+            }
+
+    def shutdown(self):
+        """Stop accepting work and release the worker threads"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+# Global executor instance
+upstream_executor = UpstreamExecutor(
+    max_workers=settings.upstream_max_workers,
+    max_queue=settings.upstream_max_queue,
+    timeout=settings.upstream_timeout
+)
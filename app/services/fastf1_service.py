@@ -1,146 +1,181 @@
-import fastf1
-import fastf1.ergast
-import pandas as pd
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+import asyncio
 import logging
+import threading
+import time
 from app.core.config import settings
-
-# Configure FastF1
-fastf1.Cache.enable_cache(settings.fastf1_cache_dir)
-fastf1.set_log_level('WARNING' if not settings.fastf1_verbose else 'INFO')
+from app.services import race_calendar
+from app.services.executor import upstream_executor
+from app.services.snapshot_store import SnapshotStore, snapshot_store, DRIVERS, RACES, STANDINGS, RESULTS
+from app.services.upstream_client import UpstreamClient
+from app.services.circuit_breaker import breakers, UpstreamUnavailableError
+from app.services.metrics import upstream_duration, upstream_errors
 
 logger = logging.getLogger(__name__)
 
+# Every Ergast request this process makes shares one connection pool and
+# rate budget; requests over budget wait instead of earning a 429
+ergast_client = UpstreamClient(
+    rate=settings.upstream_rate_limit,
+    burst=settings.upstream_rate_burst,
+    hourly=settings.upstream_hourly_limit,
+    retries=settings.upstream_retries,
+    backoff=settings.upstream_retry_backoff,
+    timeout=settings.upstream_request_timeout,
+    max_wait=settings.upstream_timeout,
+    max_connections=settings.upstream_max_connections
+)
+
+# fastf1 pulls in pandas and numpy, most of the API's import time, so it is
+# imported and configured on first use, in an upstream worker thread
+_fastf1_lock = threading.Lock()
+_fastf1_configured = False
+
+def load_fastf1():
+    """Import and configure fastf1 once"""
+    global _fastf1_configured
+    import fastf1
+    import fastf1.ergast
+    with _fastf1_lock:
+        if not _fastf1_configured:
+            # No fastf1.Cache: Ergast requests go through ergast_client, and
+            # responses are kept by cache_service and the snapshot store
+            fastf1.set_log_level('WARNING' if not settings.fastf1_verbose else 'INFO')
+            _fastf1_configured = True
+    return fastf1
+
+# Ergast methods by endpoint family; each family has its own circuit breaker
+ERGAST_FAMILIES = {
+    'get_driver_info': 'drivers',
+    'get_driver_standings': 'standings',
+    'get_race_schedule': 'races',
+    'get_race_results': 'results',
+}
+
+def _pooled_ergast_class():
+    fastf1 = load_fastf1()
+    
+    class PooledErgast(fastf1.ergast.Ergast):
+        """fastf1's Ergast interface, fetching through ergast_client"""
+        
+        @classmethod
+        def _get(cls, url: str, params: dict):
+            # fastf1 passes limit/offset as None when unset; httpx would send them empty
+            params = {name: value for name, value in params.items() if value is not None}
+            return ergast_client.get_json(url, params)
+    
+    return PooledErgast
+
 class FastF1Service:
-    def __init__(self):
+    def __init__(self, snapshots: Optional[SnapshotStore] = None):
         self.current_season = settings.current_season
         self.supported_seasons = settings.supported_seasons
-        self.ergast = fastf1.ergast.Ergast()
+        self._ergast = None
+        # Finalized seasons are read from here first, when present
+        self.snapshots = snapshots
+    
+    @property
+    def ergast(self):
+        if self._ergast is None:
+            self._ergast = _pooled_ergast_class()()
+        return self._ergast
+    
+    def _fetch(self, method: str, *args, **kwargs):
+        """Call an Ergast method; runs in an upstream worker thread"""
+        return getattr(self.ergast, method)(*args, **kwargs)
+    
+    async def _call(self, method: str, *args, **kwargs):
+        """Run an Ergast method in the executor, behind its family's circuit breaker.
+        
+        Any failure is raised as UpstreamUnavailableError; errors in the
+        caller's own processing of the result are left to surface as they are.
+        """
+        family = ERGAST_FAMILIES[method]
+        started = time.perf_counter()
+        try:
+            return await breakers.get(family).call(upstream_executor.run, self._fetch, method, *args, **kwargs)
+        except UpstreamUnavailableError as e:
+            upstream_errors.inc(family, type(e).__name__)
+            raise
+        except Exception as e:
+            upstream_errors.inc(family, type(e).__name__)
+            message = f"Error fetching {family} for {'/'.join(map(str, args))}: {e}"
+            logger.error(message)
+            raise UpstreamUnavailableError(message) from e
+        finally:
+            upstream_duration.observe(time.perf_counter() - started, family)
+    
+    async def check_upstream(self):
+        """Make one small Ergast request; raises when upstream is unavailable"""
+        await self._call('get_driver_info', self.current_season)
+    
+    def _snapshot(self, kind: str, season: int, round_num: int = 0):
+        if self.snapshots is None:
+            return None
+        return self.snapshots.get(kind, season, round_num)
     
     async def get_drivers(self, season: int = None) -> List[Dict]:
         """Get all drivers for a specific season"""
         if season is None:
             season = self.current_season
-            
-        try:
-            # Get drivers using the ergast API
-            drivers_df = self.ergast.get_driver_info(season)
-            drivers_list = []
-            
-            for _, driver in drivers_df.iterrows():
-                driver_data = {
-                    'driverId': driver['driverId'],
-                    'givenName': driver['givenName'],
-                    'familyName': driver['familyName'],
-                    'nationality': driver['driverNationality'],
-                    'permanentNumber': str(driver.get('driverNumber', '')),
-                    'portraitUrl': f"/static/drivers/{driver['driverId']}.jpg",
-                    'team': 'Unknown'  # We'll need to get this from constructor info
-                }
-                drivers_list.append(driver_data)
-                
-            return drivers_list
-            
-        except Exception as e:
-            logger.error(f"Error fetching drivers for season {season}: {e}")
-            return []
+        
+        snapshot = self._snapshot(DRIVERS, season)
+        if snapshot is not None:
+            return snapshot
+        
+        # Get drivers using the ergast API
+        drivers_df = await self._call('get_driver_info', season)
+        from app.services import transforms
+        return transforms.drivers_records(drivers_df)
     
     async def get_standings(self, season: int = None, round_num: int = None) -> List[Dict]:
         """Get driver standings for a specific season and round"""
         if season is None:
             season = self.current_season
-            
-        try:
-            # Get standings data using the ergast API
-            if round_num:
-                standings_response = self.ergast.get_driver_standings(season, round_num)
-            else:
-                # Get latest standings
-                standings_response = self.ergast.get_driver_standings(season)
-            
-            standings_list = []
-            
-            # The response contains a list of dataframes, we want the first one
-            standings_df = standings_response.content[0]
-            
-            for _, row in standings_df.iterrows():
-                standing_data = {
-                    'position': int(row['position']),
-                    'points': float(row['points']),
-                    'wins': int(row.get('wins', 0)),
-                    'driver': {
-                        'driverId': row['driverId'],
-                        'givenName': row['givenName'],
-                        'familyName': row['familyName'],
-                        'nationality': row['driverNationality'],
-                        'permanentNumber': str(row.get('driverNumber', '')),
-                        'portraitUrl': f"/static/drivers/{row['driverId']}.jpg",
-                        'team': row.get('constructorNames', ['Unknown'])[0] if row.get('constructorNames') else 'Unknown'
-                    },
-                    'constructor': {
-                        'constructorId': row.get('constructorIds', ['unknown'])[0] if row.get('constructorIds') else 'unknown',
-                        'name': row.get('constructorNames', ['Unknown'])[0] if row.get('constructorNames') else 'Unknown',
-                        'nationality': row.get('constructorNationalities', ['Unknown'])[0] if row.get('constructorNationalities') else 'Unknown'
-                    }
-                }
-                standings_list.append(standing_data)
-                
-            return standings_list
-            
-        except Exception as e:
-            logger.error(f"Error fetching standings for season {season}: {e}")
+        
+        snapshot = self._snapshot(STANDINGS, season, round_num or 0)
+        if snapshot is not None:
+            return snapshot
+        
+        # Get standings data using the ergast API
+        if round_num:
+            standings_response = await self._call('get_driver_standings', season, round_num)
+        else:
+            # Get latest standings
+            standings_response = await self._call('get_driver_standings', season)
+        
+        # The response contains a list of dataframes, we want the first one
+        if not standings_response.content:
             return []
+        from app.services import transforms
+        return transforms.standings_records(standings_response.content[0])
     
     async def get_races(self, season: int = None) -> List[Dict]:
         """Get all races for a specific season"""
         if season is None:
             season = self.current_season
-            
-        try:
-            # Get season schedule using the ergast API
-            schedule_df = self.ergast.get_race_schedule(season)
-            races = []
-            
-            for _, event in schedule_df.iterrows():
-                race_data = {
-                    'raceId': f"{season}_{event['raceName']}",
-                    'season': season,
-                    'round': int(event['round']),
-                    'raceName': event['raceName'],
-                    'circuitName': event['circuitName'],
-                    'circuitId': event['circuitId'],
-                    'date': event['raceDate'].strftime('%Y-%m-%d'),
-                    'time': event['raceTime'].strftime('%H:%M:%SZ') if pd.notna(event['raceTime']) else '12:00:00Z',
-                    'country': event['country'],
-                    'locality': event['locality'],
-                    'latitude': event.get('lat'),
-                    'longitude': event.get('long')
-                }
-                races.append(race_data)
-                
-            return races
-            
-        except Exception as e:
-            logger.error(f"Error fetching races for season {season}: {e}")
-            return []
+        
+        snapshot = self._snapshot(RACES, season)
+        if snapshot is not None:
+            return snapshot
+        
+        # Get season schedule using the ergast API
+        schedule_df = await self._call('get_race_schedule', season)
+        from app.services import transforms
+        return transforms.races_records(schedule_df, season)
     
-    async def get_next_race(self, season: int = None) -> Optional[Dict]:
-        """Get the next upcoming race"""
+    async def get_next_race(self, season: int = None, races: List[Dict] = None) -> Optional[Dict]:
+        """Get the next upcoming race, from the given schedule if already loaded"""
         if season is None:
             season = self.current_season
-            
+        
         try:
-            races = await self.get_races(season)
-            current_time = datetime.now()
-            
-            for race in races:
-                race_datetime = datetime.strptime(f"{race['date']} {race['time']}", '%Y-%m-%d %H:%M:%SZ')
-                if race_datetime > current_time:
-                    return race
-                    
-            return None
-            
+            if races is None:
+                races = await self.get_races(season)
+            # Routes use season_data.race_timeline, which is built once per schedule
+            entry = race_calendar.RaceTimeline(races).next_session(time.time())
+            return entry[2] if entry else None
+        
         except Exception as e:
             logger.error(f"Error fetching next race for season {season}: {e}")
             return None
@@ -148,31 +183,8 @@ class FastF1Service:
     async def calculate_time_remaining(self, race: Dict) -> Dict:
         """Calculate time remaining until race start"""
         try:
-            race_datetime = datetime.strptime(f"{race['date']} {race['time']}", '%Y-%m-%d %H:%M:%SZ')
-            current_time = datetime.now()
-            time_diff = race_datetime - current_time
-            
-            if time_diff.total_seconds() <= 0:
-                return {
-                    'days': 0,
-                    'hours': 0,
-                    'minutes': 0,
-                    'seconds': 0,
-                    'message': 'Race is happening now!'
-                }
-            
-            days = time_diff.days
-            hours = time_diff.seconds // 3600
-            minutes = (time_diff.seconds % 3600) // 60
-            seconds = time_diff.seconds % 60
-            
-            return {
-                'days': days,
-                'hours': hours,
-                'minutes': minutes,
-                'seconds': seconds
-            }
-            
+            return race_calendar.time_remaining(race_calendar.race_start(race).timestamp(), time.time())
+        
         except Exception as e:
             logger.error(f"Error calculating time remaining: {e}")
             return {
@@ -185,33 +197,38 @@ class FastF1Service:
     
     async def get_race_results(self, season: int, round_num: int) -> List[Dict]:
         """Get race results for a specific race"""
-        try:
-            results_df = self.ergast.get_race_results(season, round_num)
-            results_list = []
-            
-            for _, row in results_df.iterrows():
-                result_data = {
-                    'position': int(row['position']) if pd.notna(row['position']) else 0,
-                    'driver': {
-                        'driverId': row['driverId'],
-                        'givenName': row['givenName'],
-                        'familyName': row['familyName'],
-                        'nationality': row['nationality']
-                    },
-                    'constructor': {
-                        'constructorId': row.get('constructorId', 'unknown'),
-                        'name': row.get('constructorId', 'Unknown')
-                    },
-                    'status': row.get('status', 'Finished'),
-                    'points': float(row.get('points', 0))
-                }
-                results_list.append(result_data)
-                
-            return results_list
-            
-        except Exception as e:
-            logger.error(f"Error fetching race results: {e}")
+        snapshot = self._snapshot(RESULTS, season, round_num)
+        if snapshot is not None:
+            return snapshot
+        
+        results_response = await self._call('get_race_results', season, round_num)
+        # Like standings, results come back as one dataframe per race
+        if not results_response.content:
             return []
+        from app.services import transforms
+        return transforms.race_results_records(results_response.content[0])
+    
+    async def get_season_results(self, season: int) -> Dict[int, List[Dict]]:
+        """Get race results of every round of a season, keyed by round.
+        
+        Reads the season-level results query page by page, so a season costs
+        total rows / upstream_page_size requests instead of one per round.
+        """
+        snapshot_races = self._snapshot(RACES, season)
+        if snapshot_races is not None:
+            snapshots = {race['round']: self._snapshot(RESULTS, season, race['round']) for race in snapshot_races}
+            if all(results is not None for results in snapshots.values()):
+                return snapshots
+        
+        limit = settings.upstream_page_size
+        first_page = await self._call('get_race_results', season, limit=limit, offset=0)
+        # The first page tells how many rows there are; the rest are fetched together
+        pages = [first_page] + list(await asyncio.gather(*(
+            self._call('get_race_results', season, limit=limit, offset=offset)
+            for offset in range(limit, first_page.total_results, limit)
+        )))
+        from app.services import transforms
+        return transforms.season_results_records(pages)
 
 # Global instance
-fastf1_service = FastF1Service()
+fastf1_service = FastF1Service(snapshot_store if settings.snapshot_enabled else None)
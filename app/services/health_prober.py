@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+from app.services import cache_keys
+from app.services.cache_service import cache_service
+from app.services.fastf1_service import fastf1_service
+
+logger = logging.getLogger(__name__)
+
+class HealthProber:
+    """Checks upstream and data freshness in the background.
+
+    Health endpoints only read the last report, so probing them costs the
+    same however often a load balancer calls them. Freshness is read from
+    the cache every health_probe_interval; upstream is checked only every
+    health_upstream_probe_interval, since each check uses the Ergast budget.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.upstream = {
+            'status': 'unknown',
+            'last_checked': None,
+            'latency': None,
+            'consecutive_failures': 0
+        }
+        self.seasons: Dict[int, Dict] = {}
+
+    @property
+    def checked(self) -> bool:
+        return self.upstream['last_checked'] is not None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _upstream_due(self) -> bool:
+        last_checked = self.upstream['last_checked']
+        if last_checked is None or self.upstream['status'] != 'healthy':
+            return True
+        return time.time() - last_checked >= settings.health_upstream_probe_interval
+
+    async def probe(self):
+        if self._upstream_due():
+            await self._probe_upstream()
+        await self._probe_freshness()
+
+    async def _probe_upstream(self):
+        started = time.monotonic()
+        try:
+            await fastf1_service.check_upstream()
+            status = 'healthy'
+            self.upstream['consecutive_failures'] = 0
+        except Exception as e:
+            status = f"error: {str(e)}"
+            self.upstream['consecutive_failures'] += 1
+        self.upstream.update(
+            status=status,
+            last_checked=time.time(),
+            latency=round(time.monotonic() - started, 3)
+        )
+
+    async def _probe_freshness(self):
+        """Age of each cached season collection, read in one batch without touching L1"""
+        collections = {}
+        for season in settings.supported_seasons:
+            collections[season] = {
+                'drivers': cache_keys.drivers_data_key(season),
+                'races': cache_keys.races_data_key(season),
+                'standings': cache_keys.standings_data_key(season)
+            }
+        entries = await cache_service.peek_many([key for keys in collections.values() for key in keys.values()])
+        now = time.time()
+        seasons = {}
+        for season, keys in collections.items():
+            seasons[season] = {}
+            for name, key in keys.items():
+                entry = entries.get(key)
+                if entry is None:
+                    seasons[season][name] = {'cached': False}
+                else:
+                    seasons[season][name] = {
+                        'cached': True,
+                        'age': round(now - entry['stored_at'], 1),
+                        'fresh': now < entry['fresh_until']
+                    }
+        self.seasons = seasons
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.warning(f"Health probe failed: {e}")
+            await asyncio.sleep(settings.health_probe_interval)
+
+# Global instance
+health_prober = HealthProber()
@@ -0,0 +1,146 @@
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+class MemoryCache:
+    """Bounded in-process LRU cache with monotonic-clock expiry.
+
+    Entries are evicted least-recently-used first once either the entry
+    budget or the byte budget is exceeded. Sizes are supplied by the caller
+    (the serialized payload length) since measuring Python objects is costly.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at, size, tags)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry[0], entry[1]
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int = 0, tags: Iterable[str] = ()):
+        """Store value for ttl seconds, evicting LRU entries over budget"""
+        if ttl <= 0 or size > self.max_bytes:
+            self.delete(key)
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, size, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def contains(self, key: str) -> bool:
+        """Check for a live entry without touching counters or LRU order"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Get a live value without touching counters or LRU order"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[0]
+
+    def ttl(self, key: str) -> Optional[float]:
+        """Seconds until key expires, or None if it is not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            remaining = entry[1] - time.monotonic()
+            return remaining if remaining > 0 else None
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern (same semantics as Redis KEYS)"""
+        with self._lock:
+            matched = [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]
+            for key in matched:
+                self._remove(key)
+            return len(matched)
+
+    def delete_tag(self, tag: str) -> int:
+        """Delete every entry registered under tag"""
+        with self._lock:
+            keys = [k for k in self._tags.get(tag, ()) if k in self._entries]
+            for key in keys:
+                self._remove(key)
+            self._tags.pop(tag, None)
+            return len(keys)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size, tags = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'tags': len(self._tags),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
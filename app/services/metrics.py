@@ -0,0 +1,194 @@
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# In-process metrics in the Prometheus text exposition format. Everything is
+# updated from the event loop, so plain dicts are enough; recording a value
+# is a dict lookup and an addition, cheap enough to leave on in production.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache hits (sub-millisecond) up to slow upstream fetches
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labels, values))
+
+    def samples(self) -> Iterable[Sample]:
+        return ()
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] += amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def items(self) -> List[Tuple[Labels, float]]:
+        return list(self._values.items())
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in sorted(self._values.items()):
+            yield self.name, self._labels(labels), value
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in sorted(self._values.items()):
+            yield self.name, self._labels(labels), value
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (plus +Inf), the sum and the count
+        self._series: Dict[Labels, List] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", dict(base, le=_format_value(bound)), cumulative
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, count
+
+class CollectedMetric(Metric):
+    """Metric whose samples are read from elsewhere when scraped"""
+
+    def __init__(self, name: str, help: str, type: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, help)
+        self.type = type
+        self._collect = collect
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._collect():
+            yield self.name, labels, value
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self.prefix + name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self.prefix + name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(self.prefix + name, help, labels, buckets))
+
+    def collect(self, name: str, help: str, type: str, collect: Callable) -> CollectedMetric:
+        """Register a metric read at scrape time, e.g. from a service's stats()"""
+        return self._register(CollectedMetric(self.prefix + name, help, type, collect))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(self.prefix + name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+# Global registry
+metrics = MetricsRegistry(prefix="formulahub_")
+
+# Recorded in the request path
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+http_response_size = metrics.histogram(
+    "http_response_size_bytes", "HTTP response body size by route (as sent)", ("route",), SIZE_BUCKETS
+)
+cache_lookups = metrics.counter(
+    "cache_lookups_total", "get_or_set lookups by key family and result (hit, stale, miss)", ("family", "result")
+)
+upstream_duration = metrics.histogram(
+    "upstream_call_duration_seconds", "Upstream call latency by endpoint family, including queueing", ("family",)
+)
+upstream_errors = metrics.counter(
+    "upstream_errors_total", "Failed upstream calls by endpoint family and error type", ("family", "error")
+)
+
+def cache_hit_ratios() -> Iterable[Tuple[Dict[str, str], float]]:
+    """Share of lookups answered from cache (fresh or stale), per key family"""
+    totals: Dict[str, float] = defaultdict(float)
+    served: Dict[str, float] = defaultdict(float)
+    for (family, result), count in cache_lookups.items():
+        totals[family] += count
+        if result != "miss":
+            served[family] += count
+    for family in sorted(totals):
+        yield {"family": family}, served[family] / totals[family]
+
+metrics.collect("cache_hit_ratio", "Cache hit ratio by key family since start", "gauge", cache_hit_ratios)
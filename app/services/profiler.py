@@ -0,0 +1,105 @@
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+# cProfile runs on the event loop thread, so a profile covers the request's
+# own code (routing, transforms on cache hits, validation, JSON encoding)
+# plus anything else the loop ran meanwhile. Work done in upstream executor
+# threads is not included; the upstream metrics on /metrics cover that.
+
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    status: int
+    duration: float  # wall-clock seconds for the whole request
+    created_at: float
+    stats: pstats.Stats = field(repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'duration_ms': round(self.duration * 1000, 2),
+            'created_at': self.created_at
+        }
+
+    def text(self, sort: str = "cumulative", limit: int = 40) -> str:
+        """pstats report of the top functions"""
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self) -> bytes:
+        """Same bytes as cProfile's dump_stats, for snakeviz or pstats"""
+        return marshal.dumps(self.stats.stats)
+
+class ProfileStore:
+    """Last few request profiles, oldest dropped first.
+
+    cProfile allows one active profiler per thread, so only one request is
+    profiled at a time; requests arriving meanwhile run unprofiled.
+    """
+
+    def __init__(self, max_profiles: int):
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self.active = False
+        self.skipped = 0
+
+    def start(self) -> Optional[cProfile.Profile]:
+        if self.active:
+            self.skipped += 1
+            return None
+        self.active = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex[:12]
+
+    def finish(
+        self, profiler: cProfile.Profile, profile_id: str, method: str, path: str, status: int, duration: float
+    ) -> RequestProfile:
+        profiler.disable()
+        self.active = False
+        profile = RequestProfile(
+            id=profile_id,
+            method=method,
+            path=path,
+            status=status,
+            duration=duration,
+            created_at=time.time(),
+            stats=pstats.Stats(profiler)
+        )
+        self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [profile.summary() for profile in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {'kept': len(self._profiles), 'skipped': self.skipped}
+
+# Global instance
+profile_store = ProfileStore(settings.profiling_max_profiles)
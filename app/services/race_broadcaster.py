@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import AsyncIterator, Dict, Optional
+from app.core.config import settings
+from app.services import race_calendar
+from app.services.season_data import season_data
+
+logger = logging.getLogger(__name__)
+
+# Milliseconds EventSource clients wait before reconnecting
+RECONNECT_DELAY = 2000
+
+def _iso(epoch: float) -> str:
+    return time.strftime(race_calendar.SESSION_FORMAT, time.gmtime(epoch))
+
+def next_race_state(season: int, start: Optional[float], race: Optional[Dict], live: bool) -> Dict:
+    """The race clients count down to: upcoming, live, or none left this season"""
+    if race is None:
+        return {'season': season, 'status': 'none', 'race': None, 'startsAt': None, 'endsAt': None}
+    return {
+        'season': season,
+        'status': 'live' if live else 'upcoming',
+        'race': race,
+        'startsAt': _iso(start),
+        'endsAt': _iso(start + settings.race_duration)
+    }
+
+class RaceBroadcaster:
+    """Pushes the next race of the current season to every stream client.
+
+    One task follows the calendar: it wakes when a race starts or ends, and
+    every race_stream_check_interval to pick up schedule changes. A change
+    is encoded once and released to all clients through a shared event, so
+    the cost per connected client is one wake-up per change plus keep-alives.
+
+    stop() ends any streams still open at lifespan shutdown. uvicorn only
+    gets there once open responses finish, so run it with
+    --timeout-graceful-shutdown; otherwise streams run to their deadline.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self.state: Optional[Dict] = None
+        self.message: Optional[bytes] = None  # state as an encoded SSE event
+        self.version = 0
+        self.clients = 0
+        self.closed = False
+
+    async def start(self):
+        if not settings.race_stream_enabled or self._task is not None:
+            return
+        self.closed = False
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self.close()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def close(self):
+        """End every open stream; EventSource clients reconnect elsewhere"""
+        self.closed = True
+        self._publish_change()
+
+    def _publish_change(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def publish(self, state: Dict):
+        if state == self.state:
+            return
+        self.state = state
+        self.version += 1
+        data = json.dumps(state, separators=(",", ":"))
+        self.message = f"id: {self.version}\nevent: race\ndata: {data}\n\n".encode("utf-8")
+        logger.info(f"Next race is now {state['status']}: {(state['race'] or {}).get('raceId')}")
+        self._publish_change()
+
+    async def wait(self, version: int, timeout: float) -> bool:
+        """Wait up to timeout for a state newer than version; False on timeout"""
+        if self.version != version or self.closed:
+            return True
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def events(self) -> AsyncIterator[bytes]:
+        """One client's Server-Sent Events: the current state, then every change.
+
+        Streams end after about race_stream_max_duration (jittered, so clients
+        do not all reconnect together), or when the server shuts down;
+        EventSource reconnects by itself.
+        """
+        self.clients += 1
+        try:
+            yield f"retry: {RECONNECT_DELAY}\n\n".encode("utf-8")
+            deadline = time.monotonic() + settings.race_stream_max_duration * random.uniform(0.9, 1.0)
+            version = 0
+            while not self.closed:
+                if self.version != version:
+                    version = self.version
+                    yield self.message
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if not await self.wait(version, min(settings.race_stream_keepalive, remaining)):
+                    # Keeps proxies from closing an idle connection
+                    yield b": keep-alive\n\n"
+        finally:
+            self.clients -= 1
+
+    async def update(self) -> int:
+        """Recompute the state; returns seconds until it next needs checking"""
+        season = settings.current_season
+        _, timeline = await season_data.race_timeline(season)
+        now = time.time()
+        live = timeline.live_race(now)
+        start, _, race = live or timeline.next_session(now) or (None, None, None)
+        self.publish(next_race_state(season, start, race, live is not None))
+
+        interval = settings.race_stream_check_interval
+        if race is not None:
+            transition = start + settings.race_duration if live else start
+            # Wake just after the race starts or ends
+            interval = min(interval, max(1, int(transition - now) + 1))
+        return interval
+
+    async def _run(self):
+        while True:
+            try:
+                interval = await self.update()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Next race update failed: {e}")
+                interval = settings.cache_refresh_retry_interval
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict:
+        return {
+            'clients': self.clients,
+            'version': self.version,
+            'status': self.state['status'] if self.state else None
+        }
+
+# Global instance
+race_broadcaster = RaceBroadcaster()
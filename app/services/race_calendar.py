@@ -0,0 +1,126 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+# Refresh timing derived from the race calendar: data that changes after a
+# race (standings, results) is refreshed often right after a race ends and
+# rarely in between race weekends.
+
+# Sessions of a race weekend; race records carry their UTC starts under
+# 'sessions' (snapshots taken before that only have the race date and time)
+SESSIONS = ('fp1', 'fp2', 'fp3', 'qualifying', 'sprint', 'race')
+SESSION_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+def race_start(race: Dict) -> datetime:
+    """UTC start of a race record from get_races"""
+    return datetime.strptime(f"{race['date']} {race['time']}", '%Y-%m-%d %H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+def race_windows(races: List[Dict]) -> List[Tuple[datetime, datetime, Dict]]:
+    """(start, end, race) for every race, in start order"""
+    duration = timedelta(seconds=settings.race_duration)
+    windows = []
+    for race in races:
+        start = race_start(race)
+        windows.append((start, start + duration, race))
+    windows.sort(key=lambda window: window[0])
+    return windows
+
+def completed_races(races: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """Races whose results are expected by now, in start order"""
+    now = now or datetime.now(timezone.utc)
+    return [race for _, end, race in race_windows(races) if end <= now]
+
+def last_completed_race(races: List[Dict], now: Optional[datetime] = None) -> Optional[Dict]:
+    completed = completed_races(races, now)
+    return completed[-1] if completed else None
+
+def refresh_interval(season: int, races: List[Dict], now: Optional[datetime] = None) -> int:
+    """Seconds until data for a season should next be refreshed"""
+    ends = [end.timestamp() for _, end, _ in race_windows(races or [])]
+    return _refresh_interval(season, ends, (now or datetime.now(timezone.utc)).timestamp())
+
+def _refresh_interval(season: int, ends: List[float], now: float) -> int:
+    """refresh_interval over the sorted race end epochs of a season"""
+    if season < settings.current_season:
+        return settings.refresh_finalized_interval
+    i = bisect_right(ends, now)
+    last_end = ends[i - 1] if i else None
+    next_end = ends[i] if i < len(ends) else None
+
+    if last_end is not None and now - last_end < settings.refresh_hot_window:
+        # Results and standings are being published and corrected
+        return settings.refresh_hot_interval
+
+    interval = settings.refresh_idle_interval
+    if next_end is not None:
+        until_end = next_end - now
+        if until_end < settings.refresh_weekend_lead:
+            interval = settings.refresh_weekend_interval
+        # Wake up as soon as the next race ends
+        interval = min(interval, max(int(until_end), settings.refresh_hot_interval))
+    return interval
+
+def session_starts(race: Dict) -> Dict[str, float]:
+    """UTC start epoch of each known session of a race record"""
+    starts = {
+        name: datetime.strptime(value, SESSION_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+        for name, value in (race.get('sessions') or {}).items()
+        if value
+    }
+    if 'race' not in starts:
+        starts['race'] = race_start(race).timestamp()
+    return starts
+
+def time_remaining(start: float, now: float) -> Dict:
+    """Countdown from now to a start epoch, as days/hours/minutes/seconds"""
+    remaining = int(start - now)
+    if remaining <= 0:
+        return {'days': 0, 'hours': 0, 'minutes': 0, 'seconds': 0, 'message': 'Race is happening now!'}
+    days, remaining = divmod(remaining, 86400)
+    hours, remaining = divmod(remaining, 3600)
+    minutes, seconds = divmod(remaining, 60)
+    return {'days': days, 'hours': hours, 'minutes': minutes, 'seconds': seconds}
+
+class RaceTimeline:
+    """Sorted UTC start epochs of a season's races and sessions.
+
+    Built once per cached schedule, so next-race, live and next-session
+    lookups are a bisect instead of parsing every date on each request.
+    """
+
+    def __init__(self, races: List[Dict], stored_at: float = 0.0):
+        self.stored_at = stored_at
+        sessions = sorted((
+            (start, name, race['round'], race)
+            for race in races
+            for name, start in session_starts(race).items()
+        ), key=lambda entry: entry[:3])
+        # Parallel arrays per session name, plus one over every session
+        self._starts: Dict[Optional[str], List[float]] = {None: []}
+        self._entries: Dict[Optional[str], List[Tuple[str, Dict]]] = {None: []}
+        for start, name, _, race in sessions:
+            for key in (None, name):
+                self._starts.setdefault(key, []).append(start)
+                self._entries.setdefault(key, []).append((name, race))
+
+    def next_session(self, now: float, session: Optional[str] = 'race') -> Optional[Tuple[float, str, Dict]]:
+        """(start, session, race) of the first session starting after now; any session for None"""
+        starts = self._starts.get(session, [])
+        i = bisect_right(starts, now)
+        if i == len(starts):
+            return None
+        return (starts[i],) + self._entries[session][i]
+
+    def live_race(self, now: float) -> Optional[Tuple[float, str, Dict]]:
+        """(start, 'race', race) of a race started less than race_duration ago"""
+        starts = self._starts.get('race', [])
+        i = bisect_right(starts, now) - 1
+        if i < 0 or now >= starts[i] + settings.race_duration:
+            return None
+        return (starts[i],) + self._entries['race'][i]
+
+    def refresh_interval(self, season: int, now: float) -> int:
+        """refresh_interval for this schedule, without parsing it again"""
+        ends = [start + settings.race_duration for start in self._starts.get('race', [])]
+        return _refresh_interval(season, ends, now)
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+from app.services import cache_keys, race_calendar
+from app.services.cache_service import cache_service
+from app.services.season_data import season_data
+
+logger = logging.getLogger(__name__)
+
+class RefreshScheduler:
+    """Warms the cache at startup and keeps the current season fresh.
+
+    Every supported season is loaded once at startup so the first request
+    after a restart is a cache hit. After that, standings and the latest
+    results of the current season are reloaded on the race calendar: every
+    few minutes right after a race, rarely between race weekends.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.next_run: Optional[float] = None
+        self.prewarmed = False
+
+    async def start(self):
+        if not settings.refresh_scheduler_enabled or self._task is not None:
+            return
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def prewarm(self):
+        """Load the season collections of every supported season"""
+        started = time.monotonic()
+        for season in settings.supported_seasons:
+            results = await asyncio.gather(
+                season_data.get_drivers(season),
+                season_data.get_races(season),
+                season_data.get_standings(season),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Pre-warming season {season} failed: {result}")
+        self.prewarmed = True
+        logger.info(f"Pre-warmed {len(settings.supported_seasons)} seasons in {time.monotonic() - started:.1f}s")
+
+    async def refresh_season(self, season: int) -> int:
+        """Reload data that changes after races; returns seconds until the next run"""
+        races = (await season_data.get_races(season)).value or []
+        interval = race_calendar.refresh_interval(season, races)
+        # Entries another worker refreshed during this interval are left alone
+        min_age = interval / 2
+
+        if await season_data.refresh("standings", season, min_age=min_age):
+            # Rendered responses (and their projections) are rebuilt from the
+            # new collection on demand
+            await cache_service.invalidate_tags(cache_keys.views_tag(cache_keys.standings_key(season)))
+
+        race = race_calendar.last_completed_race(races)
+        if race is not None:
+            round_num = race['round']
+            if await season_data.refresh("results", season, round_num, min_age=min_age):
+                await cache_service.invalidate_tags(
+                    cache_keys.views_tag(cache_keys.race_results_key(season, round_num)),
+                    cache_keys.views_tag(cache_keys.season_results_key(season))
+                )
+        return interval
+
+    async def _run(self):
+        if settings.refresh_prewarm:
+            try:
+                await self.prewarm()
+            except Exception as e:
+                logger.warning(f"Pre-warming failed: {e}")
+        while True:
+            try:
+                interval = await self.refresh_season(settings.current_season)
+                self.runs += 1
+            except Exception as e:
+                logger.warning(f"Scheduled refresh of season {settings.current_season} failed: {e}")
+                self.failures += 1
+                interval = settings.refresh_hot_interval
+            self.last_run = time.time()
+            self.next_run = self.last_run + interval
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'prewarmed': self.prewarmed,
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_run': self.last_run,
+            'next_run': self.next_run,
+        }
+
+# Global instance
+refresh_scheduler = RefreshScheduler()
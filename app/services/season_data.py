@@ -0,0 +1,227 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services import cache_keys, race_calendar
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.services.cache_service import cache_service, CacheResult
+from app.services.fastf1_service import fastf1_service
+
+class SeasonIndex:
+    """Dict indexes over one season collection, built once per refresh.
+
+    Each named index maps a field value to the records carrying it, in
+    collection order, so get() returns the same record a linear scan would.
+    """
+
+    def __init__(
+        self, records: List[Dict], fields: Dict[str, Callable[[Dict], Any]], stored_at: float = 0.0, key: str = ""
+    ):
+        self.key = key
+        self.stored_at = stored_at
+        self.size = len(records)
+        # Single-entity responses rendered from this version of the collection
+        self.renders: Dict[str, Any] = {}
+        self._indexes: Dict[str, Dict[Any, List[Dict]]] = {name: {} for name in fields}
+        for record in records:
+            for name, field in fields.items():
+                self._indexes[name].setdefault(field(record), []).append(record)
+
+    def get(self, name: str, key: Any) -> Optional[Dict]:
+        matches = self._indexes[name].get(key)
+        return matches[0] if matches else None
+
+    def get_all(self, name: str, key: Any) -> List[Dict]:
+        return list(self._indexes[name].get(key, ()))
+
+EMPTY_INDEX = SeasonIndex([], {})
+
+# Fields each collection is indexed by
+DRIVER_FIELDS = {'driverId': lambda d: d['driverId']}
+RACE_FIELDS = {
+    'raceId': lambda r: r['raceId'],
+    'round': lambda r: r['round'],
+    'circuitId': lambda r: r['circuitId'],
+}
+STANDING_FIELDS = {'driverId': lambda s: s['driver']['driverId']}
+
+class SeasonDataService:
+    """Cached season collections, shared by list and single-entity routes.
+
+    Single drivers, races and standings are looked up in these collections
+    instead of being cached (and fetched upstream) as separate entries.
+    """
+
+    def __init__(self):
+        # Indexes keyed by the collection's cache key; rebuilt only when the
+        # cached collection is replaced
+        self._indexes: Dict[str, SeasonIndex] = {}
+        self._timelines: Dict[str, race_calendar.RaceTimeline] = {}
+
+    async def get_drivers(self, season: Optional[int] = None) -> CacheResult:
+        return await cache_service.get_or_set(**await self._drivers(cache_keys.resolve_season(season)))
+
+    async def get_races(self, season: Optional[int] = None) -> CacheResult:
+        return await cache_service.get_or_set(**await self._races(cache_keys.resolve_season(season)))
+
+    async def get_standings(self, season: Optional[int] = None, round_num: Optional[int] = None) -> CacheResult:
+        return await cache_service.get_or_set(**await self._standings(cache_keys.resolve_season(season), round_num))
+
+    async def get_race_results(self, season: int, round_num: int) -> CacheResult:
+        return await cache_service.get_or_set(**await self._race_results(season, round_num))
+
+    async def get_season(self, season: int) -> Tuple[CacheResult, CacheResult, CacheResult]:
+        """Drivers, races and latest standings of a season, read in one batched lookup.
+
+        Collections missing or stale in the batch are then loaded concurrently.
+        """
+        loaders = {
+            cache_keys.drivers_data_key(season): lambda: self.get_drivers(season),
+            cache_keys.races_data_key(season): lambda: self.get_races(season),
+            cache_keys.standings_data_key(season): lambda: self.get_standings(season),
+        }
+        entries = await cache_service.get_many(list(loaders))
+        results = {key: cache_service.cached_result(key, entries.get(key)) for key in loaders}
+        missing = [key for key, result in results.items() if result is None]
+        for key, result in zip(missing, await asyncio.gather(*(loaders[key]() for key in missing))):
+            results[key] = result
+        return tuple(results[key] for key in loaders)
+
+    async def get_season_results(self, season: int) -> Dict[int, List[Dict]]:
+        """Results of every completed round of a season, keyed by round.
+
+        Rounds already cached are read in one batch. If any is missing, the
+        whole season is fetched with the paged season-level query and split
+        into the per-round entries the single-race route reads.
+        """
+        races = (await self.get_races(season)).value or []
+        keys = {
+            race['round']: cache_keys.race_results_data_key(season, race['round'])
+            for race in race_calendar.completed_races(races)
+        }
+        if not keys:
+            return {}
+        entries = await cache_service.get_many(list(keys.values()))
+        cached = {round_num: cache_service.cached_result(key, entries.get(key)) for round_num, key in keys.items()}
+        if all(result is not None and result.value for result in cached.values()):
+            return {round_num: result.value for round_num, result in cached.items()}
+
+        fetched = await fastf1_service.get_season_results(season)
+        results = {round_num: records for round_num, records in fetched.items() if records}
+        values, tags = {}, {}
+        for round_num, records in results.items():
+            key = cache_keys.race_results_data_key(season, round_num)
+            values[key] = records
+            tags[key] = self._results_tags(season, round_num)
+        await cache_service.put_many(values, tags, ttl=await self.calendar_ttl(season))
+        return results
+
+    async def refresh(self, kind: str, season: int, round_num: Optional[int] = None, min_age: float = 0) -> Optional[CacheResult]:
+        """Reload one collection now (see CacheService.refresh)"""
+        if kind == "drivers":
+            spec = await self._drivers(season)
+        elif kind == "races":
+            spec = await self._races(season)
+        elif kind == "standings":
+            spec = await self._standings(season, round_num)
+        elif kind == "results":
+            spec = await self._race_results(season, round_num)
+        else:
+            raise ValueError(f"Unknown collection {kind}")
+        return await cache_service.refresh(**spec, min_age=min_age)
+
+    async def calendar_ttl(self, season: int) -> int:
+        """TTL for data that changes after races, timed by the season's calendar.
+
+        Pass it to get_or_set uncalled (ttl=lambda: ...), so the schedule is
+        only looked up when an entry is filled, not on every cache hit.
+        """
+        try:
+            _, timeline = await self.race_timeline(season)
+        except UpstreamUnavailableError:
+            # Without a schedule, keep whatever is fetched only briefly
+            return settings.refresh_hot_interval
+        return timeline.refresh_interval(season, time.time())
+
+    # Cache key, loader, TTL and tags of each collection
+    async def _drivers(self, season: int) -> Dict:
+        return dict(
+            key=cache_keys.drivers_data_key(season),
+            loader=lambda: fastf1_service.get_drivers(season),
+            ttl=3600,  # 1 hour cache
+            tags=[cache_keys.season_tag(season), "drivers"]
+        )
+
+    async def _races(self, season: int) -> Dict:
+        return dict(
+            key=cache_keys.races_data_key(season),
+            loader=lambda: fastf1_service.get_races(season),
+            ttl=7200,  # 2 hours cache
+            tags=[cache_keys.season_tag(season), "races"]
+        )
+
+    async def _standings(self, season: int, round_num: Optional[int]) -> Dict:
+        tags = [cache_keys.season_tag(season), "standings"]
+        if round_num:
+            tags.append(cache_keys.round_tag(season, round_num))
+        return dict(
+            key=cache_keys.standings_data_key(season, round_num),
+            loader=lambda: fastf1_service.get_standings(season, round_num),
+            ttl=lambda: self.calendar_ttl(season),
+            tags=tags
+        )
+
+    async def _race_results(self, season: int, round_num: int) -> Dict:
+        return dict(
+            key=cache_keys.race_results_data_key(season, round_num),
+            loader=lambda: fastf1_service.get_race_results(season, round_num),
+            ttl=lambda: self.calendar_ttl(season),
+            tags=self._results_tags(season, round_num)
+        )
+
+    @staticmethod
+    def _results_tags(season: int, round_num: int) -> List[str]:
+        return [cache_keys.season_tag(season), cache_keys.round_tag(season, round_num), "results"]
+
+    async def driver_index(self, season: Optional[int] = None) -> Tuple[CacheResult, SeasonIndex]:
+        season = cache_keys.resolve_season(season)
+        result = await self.get_drivers(season)
+        return result, self._index(cache_keys.drivers_data_key(season), result, DRIVER_FIELDS)
+
+    async def race_index(self, season: Optional[int] = None) -> Tuple[CacheResult, SeasonIndex]:
+        season = cache_keys.resolve_season(season)
+        result = await self.get_races(season)
+        return result, self._index(cache_keys.races_data_key(season), result, RACE_FIELDS)
+
+    async def standing_index(
+        self, season: Optional[int] = None, round_num: Optional[int] = None
+    ) -> Tuple[CacheResult, SeasonIndex]:
+        season = cache_keys.resolve_season(season)
+        result = await self.get_standings(season, round_num)
+        return result, self._index(cache_keys.standings_data_key(season, round_num), result, STANDING_FIELDS)
+
+    async def race_timeline(self, season: Optional[int] = None) -> Tuple[CacheResult, race_calendar.RaceTimeline]:
+        """Sorted race and session starts of a season, rebuilt only when the schedule is"""
+        season = cache_keys.resolve_season(season)
+        result = await self.get_races(season)
+        key = cache_keys.races_data_key(season)
+        timeline = self._timelines.get(key)
+        if timeline is None or timeline.stored_at != result.stored_at:
+            timeline = race_calendar.RaceTimeline(result.value or [], stored_at=result.stored_at)
+            self._timelines[key] = timeline
+        return result, timeline
+
+    def _index(self, key: str, result: CacheResult, fields: Dict[str, Callable[[Dict], Any]]) -> SeasonIndex:
+        if not result.value:
+            self._indexes.pop(key, None)
+            return EMPTY_INDEX
+        # stored_at identifies one cached version of the collection, across
+        # L1 refills and workers
+        index = self._indexes.get(key)
+        if index is None or index.stored_at != result.stored_at:
+            index = SeasonIndex(result.value, fields, stored_at=result.stored_at, key=key)
+            self._indexes[key] = index
+        return index
+
+# Global instance
+season_data = SeasonDataService()
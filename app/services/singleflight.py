@@ -0,0 +1,28 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func for key, or join the call already running for it"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # Shield so a cancelled caller (e.g. a client disconnect) does not
+        # cancel the shared call for every other waiter.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running"""
+        return len(self._inflight)
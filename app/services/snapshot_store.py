@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Kinds of data kept per season; round 0 is the whole-season value
+# (drivers, races, final standings), rounds 1..N are per-round values
+DRIVERS = "drivers"
+RACES = "races"
+STANDINGS = "standings"
+RESULTS = "results"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    season INTEGER PRIMARY KEY,
+    rounds INTEGER NOT NULL,
+    built_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    season INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    PRIMARY KEY (season, kind, round)
+);
+"""
+
+def _checksum(payload: str) -> str:
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+class SnapshotStore:
+    """Read-mostly SQLite store of fully-transformed data for finalized seasons.
+
+    Seasons before settings.current_season never change, so once a season
+    is written here it is served from local disk and never fetched upstream.
+    A season is written in one transaction, so readers see all of it or none.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._seasons: Optional[Dict[int, int]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def is_finalized(self, season: int) -> bool:
+        return season < settings.current_season
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not os.path.exists(self.path):
+                return None
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        return self._conn
+
+    def seasons(self) -> Dict[int, int]:
+        """Snapshotted seasons and their round counts"""
+        with self._lock:
+            if self._seasons is None:
+                conn = self._connect()
+                if conn is None:
+                    return {}
+                try:
+                    self._seasons = dict(conn.execute("SELECT season, rounds FROM seasons"))
+                except sqlite3.Error as e:
+                    logger.warning(f"Snapshot store {self.path} unreadable: {e}")
+                    self._seasons = {}
+            return self._seasons
+
+    def get(self, kind: str, season: int, round_num: int = 0) -> Optional[Any]:
+        """Snapshotted value, or None when the season is not snapshotted"""
+        if not self.is_finalized(season) or season not in self.seasons():
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT payload FROM snapshots WHERE season = ? AND kind = ? AND round = ?",
+                    (season, kind, round_num)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Snapshot read {kind} {season}/{round_num} failed: {e}")
+                row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def write_season(self, season: int, rounds: int, entries: Iterable[Tuple[str, int, Any]]):
+        """Replace one season with entries of (kind, round, value)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        rows = []
+        for kind, round_num, value in entries:
+            payload = json.dumps(value, separators=(",", ":"))
+            rows.append((season, kind, round_num, payload, _checksum(payload)))
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self._conn.execute("DELETE FROM snapshots WHERE season = ?", (season,))
+                self._conn.executemany(
+                    "INSERT INTO snapshots (season, kind, round, payload, checksum) VALUES (?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO seasons (season, rounds, built_at) VALUES (?, ?, ?)",
+                    (season, rounds, time.time())
+                )
+            self._seasons = None
+
+    def verify_season(self, season: int) -> List[str]:
+        """Problems found in a snapshotted season; empty when it is intact"""
+        rounds = self.seasons().get(season)
+        if rounds is None:
+            return [f"{season}: not snapshotted"]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, round, payload, checksum FROM snapshots WHERE season = ?", (season,)
+            ).fetchall()
+        problems = []
+        present = set()
+        for kind, round_num, payload, checksum in rows:
+            present.add((kind, round_num))
+            if _checksum(payload) != checksum:
+                problems.append(f"{season}: {kind} round {round_num} checksum mismatch")
+            elif not json.loads(payload):
+                problems.append(f"{season}: {kind} round {round_num} is empty")
+        expected = [(DRIVERS, 0), (RACES, 0), (STANDINGS, 0)]
+        for round_num in range(1, rounds + 1):
+            expected += [(STANDINGS, round_num), (RESULTS, round_num)]
+        for kind, round_num in expected:
+            if (kind, round_num) not in present:
+                problems.append(f"{season}: {kind} round {round_num} missing")
+        return problems
+
+    def stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'seasons': sorted(self.seasons()),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._seasons = None
+
+# Global instance
+snapshot_store = SnapshotStore(os.path.join(settings.snapshot_dir, "seasons.sqlite3"))
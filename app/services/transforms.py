@@ -0,0 +1,210 @@
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from app.services.race_calendar import SESSIONS
+
+# Columnar DataFrame -> response record transforms. Every column is
+# converted once with vectorized pandas operations; records are then
+# emitted in a single zip over plain Python lists, so no per-row Series
+# is built and no per-row strftime / notna / list indexing runs.
+
+def _column(df: pd.DataFrame, name: str, default: Any = None) -> pd.Series:
+    """Column by name, or a column of default when the response lacks it"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _values(series: pd.Series, default: Any = None) -> List[Any]:
+    """Plain Python values with missing entries replaced by default"""
+    series = series.astype(object)
+    return series.where(series.notna(), default).tolist()
+
+def _first(df: pd.DataFrame, name: str, default: Any) -> List[Any]:
+    """First element of a list column (e.g. constructorNames), or default"""
+    return _values(_column(df, name).str[0], default)
+
+def _ints(series: pd.Series, default: int = 0) -> List[int]:
+    return pd.to_numeric(series, errors='coerce').fillna(default).astype('int64').tolist()
+
+def _floats(series: pd.Series, default: float = 0.0) -> List[float]:
+    return pd.to_numeric(series, errors='coerce').fillna(default).astype('float64').tolist()
+
+def _numbers(series: pd.Series) -> List[str]:
+    """Permanent numbers as strings, '' when missing"""
+    numbers = pd.to_numeric(series, errors='coerce').astype('Int64').astype(str)
+    return numbers.where(numbers != '<NA>', '').tolist()
+
+def _dates(series: pd.Series) -> List[Optional[str]]:
+    return _values(pd.to_datetime(series, errors='coerce').dt.strftime('%Y-%m-%d'))
+
+def _times(series: pd.Series, default: str) -> List[str]:
+    """UTC session times (datetime.time) as HH:MM:SSZ"""
+    times = series.astype(str).str[:8] + 'Z'
+    return times.where(series.notna(), default).tolist()
+
+def _session_starts(df: pd.DataFrame, prefix: str, default_time: Optional[str] = None) -> List[Optional[str]]:
+    """UTC starts (YYYY-MM-DDTHH:MM:SSZ) of one session column pair, None when not scheduled"""
+    dates = _dates(_column(df, f'{prefix}Date'))
+    times = _times(_column(df, f'{prefix}Time'), default_time)
+    return [f"{date}T{time}" if date and time else None for date, time in zip(dates, times)]
+
+def _portraits(driver_ids: List[str]) -> List[str]:
+    return [f"/static/drivers/{driver_id}.jpg" for driver_id in driver_ids]
+
+def drivers_records(df: pd.DataFrame) -> List[Dict]:
+    """Records for get_driver_info"""
+    driver_ids = _values(df['driverId'])
+    return [
+        {
+            'driverId': driver_id,
+            'givenName': given_name,
+            'familyName': family_name,
+            'nationality': nationality,
+            'permanentNumber': number,
+            'portraitUrl': portrait,
+            'team': 'Unknown'  # We'll need to get this from constructor info
+        }
+        for driver_id, given_name, family_name, nationality, number, portrait in zip(
+            driver_ids,
+            _values(df['givenName']),
+            _values(df['familyName']),
+            _values(df['driverNationality']),
+            _numbers(_column(df, 'driverNumber')),
+            _portraits(driver_ids)
+        )
+    ]
+
+def standings_records(df: pd.DataFrame) -> List[Dict]:
+    """Records for one get_driver_standings content frame"""
+    driver_ids = _values(df['driverId'])
+    teams = _first(df, 'constructorNames', 'Unknown')
+    return [
+        {
+            'position': position,
+            'points': points,
+            'wins': wins,
+            'driver': {
+                'driverId': driver_id,
+                'givenName': given_name,
+                'familyName': family_name,
+                'nationality': nationality,
+                'permanentNumber': number,
+                'portraitUrl': portrait,
+                'team': team
+            },
+            'constructor': {
+                'constructorId': constructor_id,
+                'name': team,
+                'nationality': constructor_nationality
+            }
+        }
+        for (position, points, wins, driver_id, given_name, family_name, nationality, number, portrait,
+             team, constructor_id, constructor_nationality) in zip(
+            _ints(df['position']),
+            _floats(df['points']),
+            _ints(_column(df, 'wins', 0)),
+            driver_ids,
+            _values(df['givenName']),
+            _values(df['familyName']),
+            _values(df['driverNationality']),
+            _numbers(_column(df, 'driverNumber')),
+            _portraits(driver_ids),
+            teams,
+            _first(df, 'constructorIds', 'unknown'),
+            _first(df, 'constructorNationalities', 'Unknown')
+        )
+    ]
+
+def races_records(df: pd.DataFrame, season: Optional[int] = None) -> List[Dict]:
+    """Records for get_race_schedule; multi-season frames carry their own season column"""
+    if 'season' in df.columns:
+        seasons = _ints(df['season'])
+    else:
+        seasons = [season] * len(df)
+    race_names = _values(df['raceName'])
+    # Session names double as the schedule's column prefixes (fp1Date, raceTime)
+    session_columns = [
+        _session_starts(df, name, '12:00:00Z' if name == 'race' else None) for name in SESSIONS
+    ]
+    sessions = [
+        {name: start for name, start in zip(SESSIONS, starts) if start}
+        for starts in zip(*session_columns)
+    ]
+    return [
+        {
+            'raceId': f"{race_season}_{race_name}",
+            'season': race_season,
+            'round': round_num,
+            'raceName': race_name,
+            'circuitName': circuit_name,
+            'circuitId': circuit_id,
+            'date': date,
+            'time': time,
+            'country': country,
+            'locality': locality,
+            'latitude': latitude,
+            'longitude': longitude,
+            'sessions': race_sessions
+        }
+        for (race_season, round_num, race_name, circuit_name, circuit_id, date, time, country, locality,
+             latitude, longitude, race_sessions) in zip(
+            seasons,
+            _ints(df['round']),
+            race_names,
+            _values(df['circuitName']),
+            _values(df['circuitId']),
+            _dates(df['raceDate']),
+            _times(_column(df, 'raceTime'), '12:00:00Z'),
+            _values(df['country']),
+            _values(df['locality']),
+            _values(_column(df, 'lat')),
+            _values(_column(df, 'long')),
+            sessions
+        )
+    ]
+
+def season_results_records(pages: List[Any]) -> Dict[int, List[Dict]]:
+    """Records per round for the pages of a season-level get_race_results query.
+
+    A page holds one frame per race; a race cut off by the page limit
+    continues in the next page, so its frames are joined first.
+    """
+    frames: Dict[int, List[pd.DataFrame]] = {}
+    for page in pages:
+        for round_num, df in zip(_ints(page.description['round']), page.content):
+            frames.setdefault(round_num, []).append(df)
+    return {
+        round_num: race_results_records(parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True))
+        for round_num, parts in sorted(frames.items())
+    }
+
+def race_results_records(df: pd.DataFrame) -> List[Dict]:
+    """Records for one get_race_results content frame"""
+    return [
+        {
+            'position': position,
+            'driver': {
+                'driverId': driver_id,
+                'givenName': given_name,
+                'familyName': family_name,
+                'nationality': nationality
+            },
+            'constructor': {
+                'constructorId': constructor_id,
+                'name': constructor_name
+            },
+            'status': status,
+            'points': points
+        }
+        for (position, driver_id, given_name, family_name, nationality, constructor_id, constructor_name,
+             status, points) in zip(
+            _ints(df['position']),
+            _values(df['driverId']),
+            _values(df['givenName']),
+            _values(df['familyName']),
+            _values(df['driverNationality']),
+            _values(_column(df, 'constructorId'), 'unknown'),
+            _values(_column(df, 'constructorName'), 'Unknown'),
+            _values(_column(df, 'status'), 'Finished'),
+            _floats(_column(df, 'points'))
+        )
+    ]
@@ -0,0 +1,224 @@
+# Shared HTTP client for Ergast/Jolpica, used by the API server and by
+# worker.py. It depends on httpx only (no app settings), so the Cloudflare
+# worker can import it with its minimal requirements.
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+try:
+    import h2  # noqa: F401  HTTP/2 support for httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_BASE_URL = "https://api.jolpi.ca/ergast/f1/"
+
+# Jolpica allows a burst of 4 requests per second and 500 per hour
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 4
+DEFAULT_HOURLY = 500
+
+# Responses worth retrying; anything else is returned to the caller
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class RateBudgetExceeded(Exception):
+    """Waiting for the rate budget would take longer than allowed"""
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at rate tokens per second.
+
+    Tokens are reserved up front and may go negative, so callers queue
+    in arrival order and each one sleeps only for its own turn.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; returns the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def cancel(self):
+        """Return a reserved token that will not be used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+class UpstreamClient:
+    """Pooled keep-alive HTTP client with jittered retries and a rate budget.
+
+    One instance is shared per process. get_json is for blocking callers
+    (e.g. fastf1 running in executor threads); aget_json for async ones.
+    Both draw from the same rate budget, so bursts wait locally instead of
+    being answered with 429.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        hourly: int = DEFAULT_HOURLY,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout: float = 5.0,
+        max_wait: float = 20.0,
+        max_connections: int = 10,
+        http2: Optional[bool] = None
+    ):
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.max_connections = max_connections
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._buckets = [TokenBucket(rate, burst)]
+        if hourly:
+            self._buckets.append(TokenBucket(hourly / 3600.0, hourly))
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client_lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.errors = 0
+        self.throttled = 0.0  # total seconds spent waiting for the budget
+
+    def _client_options(self) -> Dict[str, Any]:
+        return dict(
+            http2=self.http2,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            headers={"User-Agent": "FormulaHub API"}
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_options())
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**self._client_options())
+        return self._async_client
+
+    def _url(self, path: str) -> str:
+        # Absolute URLs (as built by fastf1) are used as they are
+        return urljoin(self.base_url, path)
+
+    def _reserve(self) -> float:
+        """Reserve one request from every bucket; returns the wait in seconds"""
+        waits: List[float] = [bucket.reserve() for bucket in self._buckets]
+        wait = max(waits)
+        if wait > self.max_wait:
+            for bucket in self._buckets:
+                bucket.cancel()
+            raise RateBudgetExceeded(f"Upstream rate budget exhausted, next slot in {wait:.0f}s")
+        self.throttled += wait
+        return wait
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        # Full jitter keeps retrying workers from hitting upstream in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.retries:
+            return False
+        return response is None or response.status_code in RETRY_STATUS
+
+    def get_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET and decode JSON, blocking; raises httpx errors after the last retry"""
+        url = self._url(path)
+        attempt = 0
+        while True:
+            time.sleep(self._reserve())
+            response = None
+            try:
+                self.requests += 1
+                response = self.client.get(url, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = httpx.HTTPStatusError(
+                    f"Upstream returned {response.status_code}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+            if not self._should_retry(attempt, response):
+                self.errors += 1
+                raise error
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+            self.retried += 1
+
+    async def aget_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET and decode JSON; raises httpx errors after the last retry"""
+        url = self._url(path)
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._reserve())
+            response = None
+            try:
+                self.requests += 1
+                response = await self.async_client.get(url, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = httpx.HTTPStatusError(
+                    f"Upstream returned {response.status_code}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+            if not self._should_retry(attempt, response):
+                self.errors += 1
+                raise error
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+            self.retried += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'http2': self.http2,
+            'requests': self.requests,
+            'retried': self.retried,
+            'errors': self.errors,
+            'throttled_seconds': round(self.throttled, 3)
+        }
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
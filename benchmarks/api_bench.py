@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Offline API benchmark: every route, in process, against the Ergast stand-in
+
+Scenarios:
+  cold        empty cache before every request (upstream fetch + transform + render)
+  warm        sequential requests against a primed cache
+  concurrent  --concurrency simultaneous requests on an empty cache (coalescing)
+
+Usage: python benchmarks/api_bench.py [--season YEAR] [--requests N] [--cold N]
+                                      [--concurrency N] [--upstream-latency SECONDS]
+                                      [--output FILE] [--compare BASELINE.json]
+
+Results are written as JSON (by default to benchmarks/results/) so runs on
+different commits can be compared with --compare.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+import httpx
+
+from app.core.config import settings
+from ergast_standin import ErgastStandIn
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# (name, path); ids are discovered from the API before measuring
+ROUTES = [
+    ("drivers", "/api/drivers/?season={season}"),
+    ("driver", "/api/drivers/{driver_id}?season={season}"),
+    ("standings", "/api/standings/?season={season}"),
+    ("standings_round", "/api/standings/?season={season}&round_num={round}"),
+    ("driver_standing", "/api/standings/driver/{driver_id}?season={season}"),
+    ("races", "/api/races/?season={season}"),
+    ("next_race", "/api/races/next?season={season}"),
+    ("race", "/api/races/{race_id}?season={season}"),
+    ("race_results", "/api/races/{race_id}/results?season={season}"),
+    ("season_results", "/api/races/results?season={season}"),
+    ("bundle", "/api/seasons/{season}/bundle"),
+    ("health", "/api/health"),
+    ("ready", "/api/health/ready"),
+    ("metrics", "/metrics"),
+]
+
+def configure(season: int):
+    """Isolate the app from Redis, snapshots and background work; before importing it"""
+    settings.redis_url = None
+    settings.snapshot_enabled = False
+    settings.refresh_scheduler_enabled = False
+    settings.profiling_enabled = False
+    settings.current_season = season
+    settings.supported_seasons = [season]
+    logging.basicConfig(level=logging.ERROR)
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], statuses: Dict[int, int], elapsed: float, upstream_calls: int) -> Dict:
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": sum(n for status, n in statuses.items() if status >= 500),
+        "status": {str(status): n for status, n in sorted(statuses.items())},
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p90_ms": round(percentile(values, 90) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+        "upstream_calls": upstream_calls
+    }
+
+class Bench:
+    def __init__(self, client: httpx.AsyncClient, standin: ErgastStandIn, cache_service):
+        self.client = client
+        self.standin = standin
+        self.cache_service = cache_service
+
+    async def reset_cache(self):
+        await self.cache_service.clear_pattern("*")
+
+    async def timed_get(self, path: str, latencies: List[float], statuses: Dict[int, int]):
+        started = time.perf_counter()
+        response = await self.client.get(path)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def cold(self, path: str, iterations: int) -> Dict:
+        latencies, statuses, elapsed = [], {}, 0.0
+        calls = self.standin.calls
+        for _ in range(iterations):
+            await self.reset_cache()
+            started = time.perf_counter()
+            await self.timed_get(path, latencies, statuses)
+            elapsed += time.perf_counter() - started
+        return summarize(latencies, statuses, elapsed, self.standin.calls - calls)
+
+    async def warm(self, path: str, requests: int) -> Dict:
+        await self.client.get(path)
+        latencies, statuses = [], {}
+        calls = self.standin.calls
+        started = time.perf_counter()
+        for _ in range(requests):
+            await self.timed_get(path, latencies, statuses)
+        return summarize(latencies, statuses, time.perf_counter() - started, self.standin.calls - calls)
+
+    async def concurrent(self, path: str, concurrency: int, rounds: int) -> Dict:
+        latencies, statuses, elapsed = [], {}, 0.0
+        calls = self.standin.calls
+        for _ in range(rounds):
+            await self.reset_cache()
+            started = time.perf_counter()
+            await asyncio.gather(*(self.timed_get(path, latencies, statuses) for _ in range(concurrency)))
+            elapsed += time.perf_counter() - started
+        return summarize(latencies, statuses, elapsed, self.standin.calls - calls)
+
+async def discover_ids(client: httpx.AsyncClient, season: int) -> Dict[str, object]:
+    """A real driver, race and round to put into the route paths"""
+    drivers = (await client.get(f"/api/drivers/?season={season}")).json()["drivers"]
+    races = (await client.get(f"/api/races/?season={season}")).json()["races"]
+    return {"season": season, "driver_id": drivers[0]["driverId"], "race_id": races[0]["raceId"], "round": races[0]["round"]}
+
+async def run(args) -> Dict:
+    import main
+    from app.services.cache_service import cache_service
+    from app.services.health_prober import health_prober
+
+    standin = ErgastStandIn(latency=args.upstream_latency)
+    standin.install()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ids = await discover_ids(client, args.season)
+        await health_prober.probe()
+        bench = Bench(client, standin, cache_service)
+
+        routes = [(name, path.format(**ids)) for name, path in ROUTES if not args.routes or name in args.routes]
+        scenarios = {"cold": {}, "warm": {}, "concurrent": {}}
+        for name, path in routes:
+            scenarios["cold"][name] = await bench.cold(path, args.cold)
+            scenarios["warm"][name] = await bench.warm(path, args.requests)
+            scenarios["concurrent"][name] = await bench.concurrent(path, args.concurrency, args.concurrent_rounds)
+            print(f"  {name:<16} cold p50 {scenarios['cold'][name]['p50_ms']:>8.2f}ms  "
+                  f"warm p50 {scenarios['warm'][name]['p50_ms']:>6.2f}ms  "
+                  f"{scenarios['warm'][name]['throughput_rps']:>7.0f} rps")
+
+    await cache_service.close()
+    return {"meta": metadata(args, ids), "scenarios": scenarios}
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metadata(args, ids: Dict) -> Dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "season": args.season,
+        "ids": ids,
+        "requests": args.requests,
+        "cold_iterations": args.cold,
+        "concurrency": args.concurrency,
+        "concurrent_rounds": args.concurrent_rounds,
+        "upstream_latency": args.upstream_latency
+    }
+
+def compare(current: Dict, baseline: Dict):
+    """Print how p50/p99/throughput moved against a baseline run"""
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for scenario, routes in current["scenarios"].items():
+        for name, result in routes.items():
+            base = baseline["scenarios"].get(scenario, {}).get(name)
+            if not base:
+                continue
+            changes = []
+            for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+                if base[metric]:
+                    change = (result[metric] - base[metric]) / base[metric] * 100
+                    changes.append(f"{metric} {base[metric]:.2f} -> {result[metric]:.2f} ({change:+.0f}%)")
+            print(f"  {scenario:<10} {name:<16} " + "  ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline API benchmark against a local Ergast stand-in")
+    parser.add_argument("--season", type=int, default=datetime.now().year, help="season to serve (default: this year)")
+    parser.add_argument("--requests", type=int, default=200, help="warm requests per route")
+    parser.add_argument("--cold", type=int, default=10, help="cold requests per route")
+    parser.add_argument("--concurrency", type=int, default=50, help="simultaneous requests per concurrent round")
+    parser.add_argument("--concurrent-rounds", type=int, default=3)
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="simulated seconds per upstream request")
+    parser.add_argument("--routes", nargs="*", help=f"subset of: {' '.join(name for name, _ in ROUTES)}")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    args = parser.parse_args()
+
+    configure(args.season)
+    print(f"Benchmarking season {args.season} (upstream latency {args.upstream_latency * 1000:.0f}ms)")
+    results = asyncio.run(run(args))
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{results['meta']['commit'] or 'nogit'}-{stamp}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
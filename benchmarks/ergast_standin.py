@@ -0,0 +1,169 @@
+"""
+Local stand-in for the Ergast/Jolpica API, used by the benchmarks
+
+Responses come from recorded fixtures (benchmarks/fixtures/ergast_<season>.json,
+written by record_fixtures.py) when present, and are otherwise generated:
+a deterministic season of 24 rounds, 20 drivers and 10 constructors in the
+same JSON shape. Either way fastf1 parses them into DataFrames exactly as it
+does live responses, so transforms and validation are measured for real.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ROUNDS = 24
+DRIVERS = 20
+CONSTRUCTORS = 10
+
+def fixture_key(url: str, params: Optional[Dict]) -> str:
+    """Request identity used for recorded fixtures, e.g. 2024/1/results?limit=30&offset=0"""
+    path = urlparse(url).path
+    path = path.split("/f1/", 1)[-1]
+    if path.endswith(".json"):
+        path = path[:-5]
+    query = "&".join(f"{name}={value}" for name, value in sorted((params or {}).items()) if value is not None)
+    return f"{path}?{query}" if query else path
+
+def fixture_path(season: int, fixtures_dir: str = FIXTURES_DIR) -> str:
+    return os.path.join(fixtures_dir, f"ergast_{season}.json")
+
+def _driver(i: int) -> Dict[str, str]:
+    return {
+        "driverId": f"driver_{i}",
+        "permanentNumber": str(i + 1),
+        "code": f"D{i:02d}",
+        "url": f"http://en.wikipedia.org/wiki/Driver_{i}",
+        "givenName": f"Given{i}",
+        "familyName": f"Family{i}",
+        "dateOfBirth": f"{1990 + i % 10}-0{1 + i % 9}-1{i % 10}",
+        "nationality": ("British", "Dutch", "Spanish", "Monegasque", "Australian")[i % 5]
+    }
+
+def _constructor(i: int) -> Dict[str, str]:
+    return {
+        "constructorId": f"team_{i}",
+        "url": f"http://en.wikipedia.org/wiki/Team_{i}",
+        "name": f"Team {i}",
+        "nationality": ("British", "Italian", "Austrian", "German", "French")[i % 5]
+    }
+
+def _race(season: int, round_num: int) -> Dict[str, Any]:
+    month = 3 + (round_num - 1) * 9 // ROUNDS
+    day = 1 + (round_num * 7) % 27
+    date = f"{season}-{month:02d}-{day:02d}"
+    return {
+        "season": str(season),
+        "round": str(round_num),
+        "url": f"http://en.wikipedia.org/wiki/{season}_Grand_Prix_{round_num}",
+        "raceName": f"Grand Prix {round_num}",
+        "Circuit": {
+            "circuitId": f"circuit_{round_num}",
+            "url": f"http://en.wikipedia.org/wiki/Circuit_{round_num}",
+            "circuitName": f"Circuit {round_num}",
+            "Location": {"lat": "45.5", "long": "9.2", "locality": f"Town {round_num}", "country": f"Country {round_num}"}
+        },
+        "date": date,
+        "time": "13:00:00Z",
+        "FirstPractice": {"date": date, "time": "09:30:00Z"},
+        "SecondPractice": {"date": date, "time": "13:00:00Z"},
+        "ThirdPractice": {"date": date, "time": "10:30:00Z"},
+        "Qualifying": {"date": date, "time": "14:00:00Z"}
+    }
+
+def _mrdata(table: str, body: Dict, total: int, limit: int, offset: int) -> Dict:
+    return {"MRData": {
+        "xmlns": "", "series": "f1", "url": "", "limit": str(limit), "offset": str(offset), "total": str(total),
+        table: body
+    }}
+
+def generate(url: str, params: Optional[Dict]) -> Dict:
+    """Synthetic Ergast response for a season-level request"""
+    params = params or {}
+    limit = int(params.get("limit") or 30)
+    offset = int(params.get("offset") or 0)
+    parts = fixture_key(url, None).strip("/").split("/")
+    season = int(parts[0])
+    round_num = int(parts[1]) if len(parts) > 2 and parts[1].isdigit() else None
+    endpoint = parts[-1]
+
+    if endpoint == "drivers":
+        drivers = [_driver(i) for i in range(DRIVERS)]
+        return _mrdata("DriverTable", {"season": str(season), "Drivers": drivers[offset:offset + limit]},
+                       DRIVERS, limit, offset)
+
+    if endpoint == "driverStandings":
+        standings = [{
+            "position": str(i + 1), "positionText": str(i + 1), "points": str(450 - i * 21), "wins": str(max(0, 8 - i)),
+            "Driver": _driver(i), "Constructors": [_constructor(i // 2)]
+        } for i in range(DRIVERS)]
+        body = {"season": str(season), "StandingsLists": [{
+            "season": str(season), "round": str(round_num or ROUNDS), "DriverStandings": standings[offset:offset + limit]
+        }]}
+        return _mrdata("StandingsTable", body, DRIVERS, limit, offset)
+
+    if endpoint == "results":
+        rounds = [round_num] if round_num else list(range(1, ROUNDS + 1))
+        rows = [(r, i) for r in rounds for i in range(DRIVERS)]
+        races = []
+        for r, i in rows[offset:offset + limit]:
+            if not races or races[-1]["round"] != str(r):
+                races.append(dict(_race(season, r), Results=[]))
+            races[-1]["Results"].append({
+                "number": str(i + 1), "position": str(i + 1), "positionText": str(i + 1),
+                "points": str(max(0, 25 - i * 2)), "Driver": _driver((i + r) % DRIVERS),
+                "Constructor": _constructor(((i + r) % DRIVERS) // 2), "grid": str(i + 1), "laps": "57",
+                "status": "Finished", "Time": {"millis": str(5400000 + i * 1500), "time": f"+{i * 1.5:.3f}"}
+            })
+        return _mrdata("RaceTable", {"season": str(season), "Races": races}, len(rows), limit, offset)
+
+    if endpoint == "races" or endpoint == str(season):
+        races = [_race(season, r) for r in range(1, ROUNDS + 1)]
+        return _mrdata("RaceTable", {"season": str(season), "Races": races[offset:offset + limit]},
+                       ROUNDS, limit, offset)
+
+    raise ValueError(f"Stand-in has no response for {url}")
+
+class ErgastStandIn:
+    """Answers ergast_client.get_json calls locally, after a simulated latency"""
+
+    def __init__(self, latency: float = 0.0, fixtures_dir: str = FIXTURES_DIR):
+        self.latency = latency
+        self.fixtures_dir = fixtures_dir
+        self.calls = 0
+        self._recorded: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _recorded_response(self, url: str, params: Optional[Dict]) -> Optional[Dict]:
+        key = fixture_key(url, params)
+        season = int(key.split("/", 1)[0].split("?", 1)[0])
+        if season not in self._recorded:
+            path = fixture_path(season, self.fixtures_dir)
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._recorded[season] = json.load(f)
+            else:
+                self._recorded[season] = {}
+        return self._recorded[season].get(key)
+
+    def get_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        response = self._recorded_response(path, params)
+        if response is None:
+            return generate(path, params)
+        # fastf1 consumes responses while parsing them
+        return copy.deepcopy(response)
+
+    def install(self):
+        """Route every upstream request of this process to the stand-in"""
+        from app.services.fastf1_service import ergast_client
+        ergast_client.get_json = self.get_json
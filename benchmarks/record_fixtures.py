@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Record live Ergast/Jolpica responses as benchmark fixtures
+
+Usage: python benchmarks/record_fixtures.py SEASON [SEASON ...]
+
+Fetches everything the API serves for each season (drivers, schedule,
+standings, season results and results per round) through the regular
+service, and writes the raw responses to
+benchmarks/fixtures/ergast_<season>.json, where the Ergast stand-in picks
+them up instead of generated data.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.executor import upstream_executor
+from app.services.fastf1_service import FastF1Service, ergast_client
+from ergast_standin import FIXTURES_DIR, fixture_key, fixture_path
+
+async def record(season: int) -> int:
+    recorded = {}
+    fetch = ergast_client.get_json
+
+    def recording_get_json(path, params=None):
+        response = fetch(path, params)
+        # fastf1 consumes the response while parsing it, so keep a copy
+        recorded[fixture_key(path, params)] = copy.deepcopy(response)
+        return response
+
+    ergast_client.get_json = recording_get_json
+    try:
+        service = FastF1Service()  # no snapshots: always fetch upstream
+        races = await service.get_races(season)
+        await service.get_drivers(season)
+        await service.get_standings(season)
+        await service.get_season_results(season)
+        for race in races:
+            await service.get_standings(season, race['round'])
+            await service.get_race_results(season, race['round'])
+    finally:
+        ergast_client.get_json = fetch
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with open(fixture_path(season), "w") as f:
+        json.dump(recorded, f, separators=(",", ":"), sort_keys=True)
+    return len(recorded)
+
+def main():
+    parser = argparse.ArgumentParser(description="Record Ergast responses for the benchmarks")
+    parser.add_argument("seasons", nargs="+", type=int)
+    args = parser.parse_args()
+    try:
+        for season in args.seasons:
+            count = asyncio.run(record(season))
+            print(f"✅ {season}: {count} responses -> {fixture_path(season)}")
+    finally:
+        upstream_executor.shutdown()
+        ergast_client.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: columnar transforms vs the previous iterrows() loops
+
+Usage: python benchmarks/transforms_bench.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import time, timezone
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services import transforms
+
+# Previous row-at-a-time implementations, kept here as the baseline
+
+def iterrows_drivers(df):
+    drivers_list = []
+    for _, driver in df.iterrows():
+        drivers_list.append({
+            'driverId': driver['driverId'],
+            'givenName': driver['givenName'],
+            'familyName': driver['familyName'],
+            'nationality': driver['driverNationality'],
+            'permanentNumber': str(driver.get('driverNumber', '')),
+            'portraitUrl': f"/static/drivers/{driver['driverId']}.jpg",
+            'team': 'Unknown'
+        })
+    return drivers_list
+
+def iterrows_standings(df):
+    standings_list = []
+    for _, row in df.iterrows():
+        standings_list.append({
+            'position': int(row['position']),
+            'points': float(row['points']),
+            'wins': int(row.get('wins', 0)),
+            'driver': {
+                'driverId': row['driverId'],
+                'givenName': row['givenName'],
+                'familyName': row['familyName'],
+                'nationality': row['driverNationality'],
+                'permanentNumber': str(row.get('driverNumber', '')),
+                'portraitUrl': f"/static/drivers/{row['driverId']}.jpg",
+                'team': row.get('constructorNames', ['Unknown'])[0] if row.get('constructorNames') else 'Unknown'
+            },
+            'constructor': {
+                'constructorId': row.get('constructorIds', ['unknown'])[0] if row.get('constructorIds') else 'unknown',
+                'name': row.get('constructorNames', ['Unknown'])[0] if row.get('constructorNames') else 'Unknown',
+                'nationality': row.get('constructorNationalities', ['Unknown'])[0] if row.get('constructorNationalities') else 'Unknown'
+            }
+        })
+    return standings_list
+
+def iterrows_races(df, season):
+    races = []
+    for _, event in df.iterrows():
+        races.append({
+            'raceId': f"{season}_{event['raceName']}",
+            'season': season,
+            'round': int(event['round']),
+            'raceName': event['raceName'],
+            'circuitName': event['circuitName'],
+            'circuitId': event['circuitId'],
+            'date': event['raceDate'].strftime('%Y-%m-%d'),
+            'time': event['raceTime'].strftime('%H:%M:%SZ') if pd.notna(event['raceTime']) else '12:00:00Z',
+            'country': event['country'],
+            'locality': event['locality'],
+            'latitude': event.get('lat'),
+            'longitude': event.get('long'),
+            'sessions': iterrows_sessions(event)
+        })
+    return races
+
+def iterrows_sessions(event):
+    sessions = {}
+    for name in ('fp1', 'fp2', 'fp3', 'qualifying', 'sprint', 'race'):
+        date, time_ = event.get(f'{name}Date'), event.get(f'{name}Time')
+        if name == 'race' and pd.isna(time_):
+            time_ = '12:00:00Z'
+        elif pd.notna(time_):
+            time_ = time_.strftime('%H:%M:%SZ')
+        if pd.notna(date) and pd.notna(time_):
+            sessions[name] = f"{date.strftime('%Y-%m-%d')}T{time_}"
+    return sessions
+
+def iterrows_race_results(df):
+    results_list = []
+    for _, row in df.iterrows():
+        results_list.append({
+            'position': int(row['position']) if pd.notna(row['position']) else 0,
+            'driver': {
+                'driverId': row['driverId'],
+                'givenName': row['givenName'],
+                'familyName': row['familyName'],
+                'nationality': row['driverNationality']
+            },
+            'constructor': {
+                'constructorId': row.get('constructorId', 'unknown'),
+                'name': row.get('constructorName', 'Unknown')
+            },
+            'status': row.get('status', 'Finished'),
+            'points': float(row.get('points', 0))
+        })
+    return results_list
+
+# Synthetic frames with the columns and dtypes fastf1's Ergast interface returns
+
+def driver_frame(rows):
+    return pd.DataFrame({
+        'driverId': [f"driver{i}" for i in range(rows)],
+        'driverNumber': [i % 99 + 1 for i in range(rows)],
+        'driverCode': [f"D{i % 100:02d}" for i in range(rows)],
+        'givenName': [f"Given{i}" for i in range(rows)],
+        'familyName': [f"Family{i}" for i in range(rows)],
+        'dateOfBirth': pd.to_datetime(["1990-01-01"] * rows),
+        'driverNationality': ["Nowhere"] * rows,
+    })
+
+def standings_frame(rows):
+    df = driver_frame(rows)
+    df.insert(0, 'position', range(1, rows + 1))
+    df.insert(1, 'points', [float(rows - i) for i in range(rows)])
+    df.insert(2, 'wins', [i % 5 for i in range(rows)])
+    df['constructorIds'] = [[f"team{i % 10}"] for i in range(rows)]
+    df['constructorNames'] = [[f"Team {i % 10}"] for i in range(rows)]
+    df['constructorNationalities'] = [["Land"] for _ in range(rows)]
+    return df
+
+def schedule_frame(rows, season):
+    return pd.DataFrame({
+        'season': [season] * rows,
+        'round': range(1, rows + 1),
+        'raceName': [f"Grand Prix {i}" for i in range(rows)],
+        'raceDate': pd.date_range(f"{season}-03-01", periods=rows, freq="D"),
+        'raceTime': [time(14, 0, tzinfo=timezone.utc) if i % 7 else None for i in range(rows)],
+        'fp1Date': pd.date_range(f"{season}-02-27", periods=rows, freq="D"),
+        'fp1Time': [time(10, 30, tzinfo=timezone.utc) if i % 5 else None for i in range(rows)],
+        'qualifyingDate': pd.date_range(f"{season}-02-28", periods=rows, freq="D"),
+        'qualifyingTime': [time(15, 0, tzinfo=timezone.utc)] * rows,
+        'circuitId': [f"circuit{i}" for i in range(rows)],
+        'circuitName': [f"Circuit {i}" for i in range(rows)],
+        'lat': [1.5] * rows,
+        'long': [2.5] * rows,
+        'locality': [f"Town{i}" for i in range(rows)],
+        'country': [f"Country{i}" for i in range(rows)],
+    })
+
+def results_frame(rows):
+    df = driver_frame(rows)
+    df.insert(0, 'position', range(1, rows + 1))
+    df.insert(1, 'points', [float(max(0, 25 - i)) for i in range(rows)])
+    df.insert(2, 'status', ["Finished"] * rows)
+    df['constructorId'] = [f"team{i % 10}" for i in range(rows)]
+    df['constructorName'] = [f"Team {i % 10}" for i in range(rows)]
+    return df
+
+def bench(name, baseline, columnar, repeat):
+    # Both paths must produce identical records before timing means anything
+    assert baseline() == columnar(), f"{name}: outputs differ"
+    before = min(timeit.repeat(baseline, number=1, repeat=repeat))
+    after = min(timeit.repeat(columnar, number=1, repeat=repeat))
+    print(f"{name:<14} iterrows {before * 1000:9.2f} ms   columnar {after * 1000:8.2f} ms   {before / after:6.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="rows per frame (whole-history queries reach thousands)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions, best is reported")
+    args = parser.parse_args()
+
+    season = 2025
+    drivers = driver_frame(args.rows)
+    standings = standings_frame(args.rows)
+    schedule = schedule_frame(args.rows, season)
+    results = results_frame(args.rows)
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    bench("drivers", lambda: iterrows_drivers(drivers), lambda: transforms.drivers_records(drivers), args.repeat)
+    bench("standings", lambda: iterrows_standings(standings), lambda: transforms.standings_records(standings), args.repeat)
+    bench("races", lambda: iterrows_races(schedule, season), lambda: transforms.races_records(schedule, season), args.repeat)
+    bench("race_results", lambda: iterrows_race_results(results), lambda: transforms.race_results_records(results), args.repeat)
+
+if __name__ == "__main__":
+    main()
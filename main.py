@@ -1,17 +1,45 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
 import uvicorn
 import os
-from app.api.routes import drivers, standings, races, health
-# from app.core.config import settings
+from app.api.routes import drivers, standings, races, seasons, health, metrics, profiles
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware, PROFILES_PATH
+from app.services.profiler import profile_store
+from app.services.executor import upstream_executor
+from app.services.cache_service import cache_service
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.health_prober import health_prober
+from app.services.race_broadcaster import race_broadcaster
+from app.services.fastf1_service import ergast_client
+from app.core.config import settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await cache_service.connect()
+    # Pre-warm supported seasons and keep the current one fresh
+    await refresh_scheduler.start()
+    # Health endpoints report what this prober last saw
+    await health_prober.start()
+    # Pushes next-race changes to /api/races/next/stream clients
+    await race_broadcaster.start()
+    yield
+    # Release the Redis pool and upstream worker threads on shutdown
+    await race_broadcaster.stop()
+    await health_prober.stop()
+    await refresh_scheduler.stop()
+    await cache_service.close()
+    upstream_executor.shutdown()
+    ergast_client.close()
 
 app = FastAPI(
     title="FormulaHub API",
     description="FastAPI backend for FormulaHub with FastF1 integration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
@@ -30,6 +58,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling; without it requests go straight through
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        token=settings.profiling_token,
+        sample_rate=settings.profiling_sample_rate
+    )
+
+# Request metrics for /metrics; added last (outermost) so it also times
+# CORS handling and, when enabled, profiling
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Mount static files only if directory exists
 static_dir = "app/static"
 if os.path.exists(static_dir):
@@ -40,6 +82,11 @@ app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(drivers.router, prefix="/api/drivers", tags=["drivers"])
 app.include_router(standings.router, prefix="/api/standings", tags=["standings"])
 app.include_router(races.router, prefix="/api/races", tags=["races"])
+app.include_router(seasons.router, prefix="/api/seasons", tags=["seasons"])
+if settings.metrics_enabled:
+    app.include_router(metrics.router, tags=["metrics"])
+if settings.profiling_enabled:
+    app.include_router(profiles.router, prefix=PROFILES_PATH, tags=["profiling"], include_in_schema=False)
 
 @app.get("/")
 async def root():
@@ -55,5 +102,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # Stop waiting on open race streams so the lifespan shutdown runs
+        timeout_graceful_shutdown=10
     )
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Build and verify on-disk snapshots of finalized seasons
+
+Usage:
+  python manage_snapshots.py build [SEASON ...]
+  python manage_snapshots.py verify [SEASON ...] [--upstream]
+  python manage_snapshots.py list
+
+Without seasons, every supported season before the current one is used.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import List, Tuple, Any
+
+from app.core.config import settings
+from app.services.executor import upstream_executor
+from app.services.fastf1_service import FastF1Service
+from app.services.circuit_breaker import UpstreamUnavailableError
+from app.services.snapshot_store import snapshot_store, DRIVERS, RACES, STANDINGS, RESULTS
+
+async def fetch_season(service: FastF1Service, season: int) -> Tuple[int, List[Tuple[str, int, Any]]]:
+    """Every snapshot entry of a season, fetched upstream"""
+    # Results of all rounds come from the paged season-level query
+    drivers, races, standings, results = await asyncio.gather(
+        service.get_drivers(season), service.get_races(season), service.get_standings(season),
+        service.get_season_results(season)
+    )
+    entries = [(DRIVERS, 0, drivers), (RACES, 0, races), (STANDINGS, 0, standings)]
+
+    # Stay within the executor's thread budget
+    limit = asyncio.Semaphore(settings.upstream_max_workers)
+
+    async def fetch_round(round_num: int):
+        async with limit:
+            round_standings = await service.get_standings(season, round_num)
+        return [(STANDINGS, round_num, round_standings), (RESULTS, round_num, results.get(round_num, []))]
+
+    rounds = [race['round'] for race in races]
+    for round_entries in await asyncio.gather(*(fetch_round(round_num) for round_num in rounds)):
+        entries += round_entries
+    return len(rounds), entries
+
+async def build(seasons: List[int]) -> int:
+    service = FastF1Service()  # no snapshots: always fetch upstream
+    failed = 0
+    for season in seasons:
+        if not snapshot_store.is_finalized(season):
+            print(f"❌ {season}: not finalized (current season is {settings.current_season})")
+            failed += 1
+            continue
+        try:
+            rounds, entries = await fetch_season(service, season)
+        except UpstreamUnavailableError as e:
+            print(f"❌ {season}: {e}")
+            failed += 1
+            continue
+        empty = [f"{kind} round {round_num}" for kind, round_num, value in entries if not value]
+        if not rounds or empty:
+            # Never store a partial season; it would be served forever
+            print(f"❌ {season}: upstream returned no data for {', '.join(empty) or 'races'}")
+            failed += 1
+            continue
+        snapshot_store.write_season(season, rounds, entries)
+        print(f"✅ {season}: {rounds} rounds, {len(entries)} entries")
+    return failed
+
+async def verify(seasons: List[int], upstream: bool) -> int:
+    service = FastF1Service()
+    failed = 0
+    for season in seasons:
+        problems = snapshot_store.verify_season(season)
+        if upstream and not problems:
+            try:
+                _, entries = await fetch_season(service, season)
+            except UpstreamUnavailableError as e:
+                problems.append(f"{season}: {e}")
+                entries = []
+            for kind, round_num, value in entries:
+                if snapshot_store.get(kind, season, round_num) != value:
+                    problems.append(f"{season}: {kind} round {round_num} differs from upstream")
+        if problems:
+            failed += 1
+            for problem in problems:
+                print(f"❌ {problem}")
+        else:
+            print(f"✅ {season}: intact")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and verify finalized-season snapshots")
+    parser.add_argument("command", choices=["build", "verify", "list"])
+    parser.add_argument("seasons", nargs="*", type=int)
+    parser.add_argument("--upstream", action="store_true", help="verify: also compare against fresh upstream data")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for season, rounds in sorted(snapshot_store.seasons().items()):
+            print(f"{season}: {rounds} rounds")
+        return
+
+    seasons = args.seasons or [s for s in settings.supported_seasons if snapshot_store.is_finalized(s)]
+    try:
+        if args.command == "build":
+            failed = asyncio.run(build(seasons))
+        else:
+            failed = asyncio.run(verify(seasons, args.upstream))
+    finally:
+        upstream_executor.shutdown()
+        snapshot_store.close()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
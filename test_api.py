@@ -6,10 +6,17 @@ Simple test script for FormulaHub FastAPI Backend
 import asyncio
 import httpx
 import json
+import os
+import subprocess
+import sys
 from datetime import datetime
 
 BASE_URL = "http://localhost:8000"
 
+# Importing the API must stay cheap: these load lazily on first upstream call
+LAZY_MODULES = ("fastf1", "pandas", "numpy")
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "1.5"))  # seconds for `import main`
+
 async def test_endpoint(client, endpoint, description):
     """Test a single endpoint"""
     try:
@@ -29,6 +36,46 @@ async def test_endpoint(client, endpoint, description):
     except Exception as e:
         print(f"❌ {description} - Error: {str(e)}")
 
+def check_import_time():
+    """Profile `import main` in a fresh interpreter with -X importtime"""
+    print("\n🔍 Profiling import time...")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        print(f"❌ Import failed:\n{proc.stderr[-2000:]}")
+        return False
+    
+    # Lines look like "import time:  <self us> | <cumulative us> | <indented module>"
+    modules = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((int(parts[1]) / 1e6, depth, name.strip()))
+    
+    total = next((seconds for seconds, _, name in modules if name == "main"), 0.0)
+    print(f"   ⏱️  import main: {total:.3f}s (budget {IMPORT_TIME_BUDGET:.1f}s)")
+    for seconds, _, name in sorted((m for m in modules if m[1] == 1), reverse=True)[:8]:
+        print(f"      {seconds:.3f}s  {name}")
+    
+    eager = sorted({name.split(".")[0] for _, _, name in modules} & set(LAZY_MODULES))
+    ok = True
+    if eager:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(eager)}")
+        ok = False
+    if total > IMPORT_TIME_BUDGET:
+        print("❌ Import time over budget")
+        ok = False
+    if ok:
+        print("✅ Import time")
+    return ok
+
 async def main():
     """Run all API tests"""
     print("🚀 FormulaHub FastAPI Backend Test Suite")
@@ -36,6 +83,9 @@ async def main():
     print(f"📍 Base URL: {BASE_URL}")
     print(f"⏰ Test Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # Cold start regressions: no server needed
+    import_time_ok = check_import_time()
+    
     async with httpx.AsyncClient(timeout=30.0) as client:
         # Test health endpoint
         await test_endpoint(client, "/api/health", "Health Check")
@@ -58,6 +108,9 @@ async def main():
     print("\n" + "=" * 50)
     print("🏁 Test suite completed!")
     print("📚 API Documentation: http://localhost:8000/docs")
+    
+    if not import_time_ok:
+        sys.exit(1)
 
 if __name__ == "__main__":
     asyncio.run(main())
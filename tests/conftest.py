@@ -0,0 +1,32 @@
+import fakeredis
+import pytest
+from app.services.cache_service import CacheService
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def redis_server():
+    """One fake Redis, shared by every worker a test starts"""
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def make_cache(redis_server):
+    """Cache services standing in for separate workers; Redis-backed unless redis=False"""
+    services = []
+
+    def make(redis: bool = True) -> CacheService:
+        service = CacheService()
+        if redis:
+            service.redis_client = fakeredis.FakeAsyncRedis(server=redis_server)
+            service.connected = True
+        services.append(service)
+        return service
+
+    return make
+
+@pytest.fixture(params=["redis", "memory"])
+def cache(request, make_cache) -> CacheService:
+    """A cache service with Redis as L2, and one with the in-process tier only"""
+    return make_cache(redis=request.param == "redis")
@@ -0,0 +1,19 @@
+import pytest
+from app.services import cache_codec
+from app.services.cache_codec import CachedResponse
+
+def test_round_trips_values_with_responses():
+    response = CachedResponse(body=b'{"a":1}', etag='"e"', encodings={"gzip": b"\x1f\x8b", "br": b"\x00"})
+    value = {"value": response, "stored_at": 1.5, "tags": ["a", "b"], "nested": {"n": None}}
+
+    decoded = cache_codec.loads(cache_codec.dumps(value))
+
+    assert decoded == value
+    assert isinstance(decoded["value"], CachedResponse)
+
+def test_unknown_payloads_read_as_missing():
+    assert cache_codec.loads(b"\x80\x04pickled") is None
+
+def test_only_json_values_are_cacheable():
+    with pytest.raises(TypeError):
+        cache_codec.dumps({"value": object()})
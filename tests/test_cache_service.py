@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from app.services import cache_keys
+
+pytestmark = pytest.mark.anyio
+
+class Loader:
+    """Async loader returning the queued values in turn and counting its calls"""
+
+    def __init__(self, *values, delay: float = 0):
+        self.values = list(values)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        value = self.values.pop(0) if len(self.values) > 1 else self.values[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+async def settle(cache):
+    """Wait for background refreshes to finish"""
+    while cache._background:
+        await asyncio.gather(*list(cache._background))
+
+async def test_concurrent_misses_share_one_load(cache):
+    loader = Loader({"v": 1}, delay=0.05)
+    results = await asyncio.gather(*(cache.get_or_set("k", loader) for _ in range(10)))
+    assert loader.calls == 1
+    assert all(result.value == {"v": 1} and not result.hit for result in results)
+
+    result = await cache.get_or_set("k", loader)
+    assert result.hit and result.value == {"v": 1}
+    assert loader.calls == 1
+
+async def test_workers_share_entries_through_redis(make_cache):
+    first, second = make_cache(), make_cache()
+    await first.get_or_set("k", Loader({"v": 1}))
+
+    loader = Loader({"v": 2})
+    result = await second.get_or_set("k", loader)
+    assert result.hit and result.value == {"v": 1}
+    assert loader.calls == 0
+    assert second.stats()["l2"]["hits"] == 1
+
+async def test_stale_entry_is_served_then_refreshed(cache):
+    loader = Loader({"v": 1}, {"v": 2})
+    await cache.get_or_set("k", loader, ttl=0, stale_ttl=60)
+
+    stale = await cache.get_or_set("k", loader, ttl=60, stale_ttl=60)
+    assert stale.stale and stale.value == {"v": 1}
+    await settle(cache)
+
+    fresh = await cache.get_or_set("k", loader, ttl=60, stale_ttl=60)
+    assert not fresh.stale and fresh.value == {"v": 2}
+    assert loader.calls == 2
+
+async def test_failed_refresh_keeps_value_and_waits_to_retry(cache):
+    loader = Loader({"v": 1}, ConnectionError("down"))
+    await cache.get_or_set("k", loader, ttl=0, stale_ttl=60)
+
+    await cache.get_or_set("k", loader, ttl=0, stale_ttl=60)
+    await settle(cache)
+    assert loader.calls == 2
+
+    result = await cache.get_or_set("k", loader, ttl=0, stale_ttl=60)
+    assert result.value == {"v": 1}
+    assert result.stale and result.degraded
+    # No new attempt before cache_refresh_retry_interval
+    await settle(cache)
+    assert loader.calls == 2
+
+async def test_missing_value_is_cached_briefly(cache):
+    loader = Loader(None)
+    for _ in range(3):
+        result = await cache.get_or_set("k", loader, negative_ttl=60)
+        assert result.value is None
+    assert loader.calls == 1
+
+async def test_missing_value_never_replaces_a_good_one(cache):
+    await cache.get_or_set("k", Loader({"v": 1}), ttl=0, stale_ttl=60)
+    assert await cache.refresh("k", Loader(None)) is None
+
+    result = await cache.get_or_set("k", Loader(None), ttl=0, stale_ttl=60)
+    assert result.value == {"v": 1}
+
+async def test_callable_ttl_is_only_awaited_on_fill(cache):
+    awaited = []
+
+    async def ttl():
+        awaited.append(1)
+        return 60
+
+    await cache.get_or_set("k", Loader({"v": 1}), ttl=ttl)
+    for _ in range(3):
+        assert (await cache.get_or_set("k", Loader({"v": 2}), ttl=ttl)).hit
+    assert awaited == [1]
+
+async def test_invalidate_tags_drops_tagged_entries(cache):
+    await cache.get_or_set("a", Loader({"v": 1}), tags=["season:2024"])
+    await cache.get_or_set("b", Loader({"v": 1}), tags=["season:2025"])
+
+    await cache.invalidate_tags("season:2024")
+
+    assert await cache.get("a") is None
+    assert await cache.get("b") is not None
+
+async def test_invalidation_reaches_other_workers_through_redis(make_cache):
+    first, second = make_cache(), make_cache()
+    await first.get_or_set("a", Loader({"v": 1}), tags=["drivers"])
+
+    await second.invalidate_tags("drivers")
+
+    result = await make_cache().get_or_set("a", Loader({"v": 2}))
+    assert result.value == {"v": 2}
+
+async def test_replacing_a_collection_drops_its_renderings(cache):
+    data_key = cache_keys.drivers_data_key(2024)
+    await cache.get_or_set(data_key, Loader([{"driverId": "a"}]))
+    await cache.get_or_set("drivers:2024", Loader({"v": 1}), tags=[cache_keys.source_tag(data_key)])
+    await cache.get_or_set("races:2024", Loader({"v": 1}))
+
+    await cache.refresh(data_key, Loader([{"driverId": "b"}]))
+
+    assert await cache.get("drivers:2024") is None
+    assert await cache.get("races:2024") is not None
+
+async def test_put_many_drops_renderings_of_replaced_collections(cache):
+    data_key = cache_keys.race_results_data_key(2024, 1)
+    await cache.get_or_set("season_results:2024", Loader({"v": 1}), tags=[cache_keys.source_tag(data_key)])
+
+    await cache.put_many({data_key: [{"position": 1}]}, {data_key: []})
+
+    assert await cache.get("season_results:2024") is None
+    result = await cache.get_or_set(data_key, Loader(None))
+    assert result.hit and result.value == [{"position": 1}]
+
+async def test_peek_many_leaves_l1_alone(cache):
+    await cache.get_or_set("k", Loader({"v": 1}))
+    before = cache._l1.stats()
+
+    entries = await cache.peek_many(["k", "missing"])
+
+    assert list(entries) == ["k"]
+    assert set(entries["k"]) == {"stored_at", "fresh_until"}
+    after = cache._l1.stats()
+    assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])
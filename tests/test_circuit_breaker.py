@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.services.executor import UpstreamBusyError
+
+pytestmark = pytest.mark.anyio
+
+async def ok():
+    return "ok"
+
+async def fail():
+    raise ConnectionError("down")
+
+async def busy():
+    raise UpstreamBusyError("queue full")
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker._state = OPEN
+    return breaker
+
+async def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+    await breaker.call(ok)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert breaker.stats()["rejected"] == 1
+
+async def test_local_errors_do_not_count():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    with pytest.raises(UpstreamBusyError):
+        await breaker.call(busy)
+    assert breaker.state == CLOSED
+
+async def test_successful_trial_closes():
+    breaker = half_open_breaker()
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == CLOSED
+
+async def test_failed_trial_opens_again():
+    breaker = half_open_breaker()
+    breaker.reset_timeout = 60
+    breaker._opened_at = 0
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(ConnectionError):
+        await breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+
+async def test_ignored_trial_releases_its_slot():
+    breaker = half_open_breaker()
+    with pytest.raises(UpstreamBusyError):
+        await breaker.call(busy)
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(ok) == "ok"
+
+async def test_cancelled_trial_releases_its_slot():
+    breaker = half_open_breaker()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    trial = asyncio.ensure_future(breaker.call(hang))
+    await started.wait()
+    # The trial holds the only half-open slot
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == CLOSED
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import pytest
+from app.services.executor import UpstreamBusyError, UpstreamExecutor, UpstreamTimeoutError
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def executor():
+    executor = UpstreamExecutor(max_workers=1, max_queue=2, timeout=5)
+    yield executor
+    executor.shutdown()
+
+async def occupy(executor: UpstreamExecutor) -> threading.Event:
+    """Hold the only worker until the returned event is set"""
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    asyncio.ensure_future(executor.run(block))
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    return release
+
+async def drained(executor: UpstreamExecutor):
+    async def idle():
+        while executor.stats()["active"] or executor.stats()["queued"]:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(idle(), 2)
+
+async def test_completed_calls_are_counted(executor):
+    assert await executor.run(sum, [1, 2]) == 3
+    with pytest.raises(ZeroDivisionError):
+        await executor.run(divmod, 1, 0)
+    stats = executor.stats()
+    assert (stats["completed"], stats["failed"], stats["queued"], stats["active"]) == (1, 1, 0, 0)
+
+async def test_cancelled_queued_call_leaves_the_queue(executor):
+    release = await occupy(executor)
+    queued = asyncio.ensure_future(executor.run(sum, [1]))
+    await asyncio.sleep(0.01)
+    assert executor.stats()["queued"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert executor.stats()["queued"] == 0
+
+    release.set()
+    await drained(executor)
+    assert executor.stats()["completed"] == 1
+
+async def test_timed_out_queued_call_leaves_the_queue(executor):
+    release = await occupy(executor)
+    with pytest.raises(UpstreamTimeoutError):
+        await executor.run(sum, [1], timeout=0.05)
+    stats = executor.stats()
+    assert (stats["queued"], stats["timeouts"]) == (0, 1)
+
+    release.set()
+    await drained(executor)
+
+async def test_full_queue_rejects_until_calls_leave_it(executor):
+    release = await occupy(executor)
+    queued = [asyncio.ensure_future(executor.run(sum, [1])) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    with pytest.raises(UpstreamBusyError):
+        await executor.run(sum, [1])
+    assert executor.stats()["rejected"] == 1
+
+    for call in queued:
+        call.cancel()
+    await asyncio.gather(*queued, return_exceptions=True)
+    release.set()
+    await drained(executor)
+    # Cancelled calls do not keep their queue slots
+    assert await executor.run(sum, [1]) == 1
@@ -0,0 +1,50 @@
+import time
+from app.services.memory_cache import MemoryCache
+
+def test_evicts_least_recently_used_over_entry_budget():
+    cache = MemoryCache(max_entries=2, max_bytes=1000)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+def test_evicts_over_byte_budget():
+    cache = MemoryCache(max_entries=10, max_bytes=100)
+    cache.set("a", 1, ttl=60, size=60)
+    cache.set("b", 2, ttl=60, size=60)
+
+    assert cache.keys() == ["b"]
+    # Larger than the whole budget: not stored at all
+    cache.set("c", 3, ttl=60, size=200)
+    assert cache.get("c") is None
+
+def test_expired_entries_are_misses():
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_delete_tag_drops_its_entries():
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", 1, ttl=60, tags=["t"])
+    cache.set("b", 2, ttl=60, tags=["t", "u"])
+    cache.set("c", 3, ttl=60, tags=["u"])
+
+    assert cache.delete_tag("t") == 2
+    assert cache.keys() == ["c"]
+
+def test_peek_does_not_touch_counters_or_order():
+    cache = MemoryCache(max_entries=2, max_bytes=1000)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+
+    assert cache.peek("a") == 1
+    cache.set("c", 3, ttl=60)
+
+    assert cache.keys() == ["b", "c"]
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
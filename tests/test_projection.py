@@ -0,0 +1,43 @@
+import pytest
+from fastapi import HTTPException
+from app.api.projection import Projection, field_paths, parse_fields
+from app.models.schemas import DriverStandingResponse
+
+def test_field_paths_use_aliases_and_dot_nested_models():
+    paths = field_paths(DriverStandingResponse)
+    assert "position" in paths
+    assert "driver.driverId" in paths
+    assert "driver" not in paths
+
+def test_parse_fields_keeps_model_order_and_expands_objects():
+    fields = parse_fields("driver, points,position", DriverStandingResponse)
+    assert fields[:2] == ("position", "points")
+    assert all(path.startswith("driver.") for path in fields[2:])
+    assert "driver.driverId" in fields
+
+@pytest.mark.parametrize("fields", ["nope", "driver.nope", "", " , "])
+def test_parse_fields_rejects_unknown_or_empty(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(fields, DriverStandingResponse)
+    assert error.value.status_code == 400
+
+RECORDS = [
+    {"position": 1, "points": 25.0, "driver": {"driverId": "a", "givenName": "A"}},
+    {"position": 2, "points": 18.0, "driver": None},
+]
+
+def test_apply_selects_nested_fields():
+    projection = Projection(DriverStandingResponse, fields=("position", "driver.driverId"))
+    assert projection.apply(RECORDS) == [
+        {"position": 1, "driver": {"driverId": "a"}},
+        {"position": 2, "driver": {"driverId": None}},
+    ]
+
+def test_apply_compact_returns_parallel_arrays():
+    projection = Projection(DriverStandingResponse, fields=("position", "driver.driverId"), compact=True)
+    assert projection.apply(RECORDS) == {"position": [1, 2], "driver.driverId": ["a", None]}
+
+def test_view_names_each_rendering():
+    assert Projection(DriverStandingResponse).view is None
+    assert Projection(DriverStandingResponse, fields=("position",)).view == "fields=position"
+    assert Projection(DriverStandingResponse, compact=True).view == "format=compact"
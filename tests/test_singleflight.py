@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from app.services.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+async def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    results = await asyncio.gather(*(flights.do("k", load) for _ in range(5)))
+    assert results == [1] * 5
+    assert flights.in_flight() == 0
+
+    # A finished call is not reused
+    assert await flights.do("k", load) == 2
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def load():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("k", load))
+    await started.wait()
+    second = asyncio.ensure_future(flights.do("k", load))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == "done"
+
+async def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("down")
+
+    results = await asyncio.gather(*(flights.do("k", load) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
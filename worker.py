@@ -1,11 +1,15 @@
 import json
 import asyncio
 from datetime import datetime, timedelta
-import httpx
+from app.services.upstream_client import UpstreamClient
 
 # Simple in-memory cache for Cloudflare Workers
 cache = {}
 
+# One pooled client for the worker's lifetime: keep-alive connections,
+# retries and the shared Jolpica rate budget
+ergast_client = UpstreamClient()
+
 class Response:
     def __init__(self, body, status=200, headers=None):
         self.body = body
@@ -30,9 +34,7 @@ def set_cached_data(key, data):
 async def fetch_f1_data(endpoint):
     """Fetch data from Ergast API as fallback"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://ergast.com/api/f1/{endpoint}")
-            return response.json()
+        return await ergast_client.aget_json(endpoint)
     except Exception as e:
         return {"error": str(e)}
 